@@ -9,8 +9,5 @@ class Exp(Experiment):
         super().__init__(filename=None)
         self.signal.connect(self.print_something)
 
-    def initialize(self):
-        self.signal.connect(self.print_something)
-
     def print_something(self, *args):
         print('something')
@@ -0,0 +1,42 @@
+"""
+Camera setup
+============
+Setup shared by the camera examples (``publisher_camera_sends.py``, ``push_camera_sends.py``,
+``pull_camera_receive.py``, ``subscriber_camera_receive.py`` and ``test_fps.py``). It is tuned with environment
+variables:
+
+- ``CAMERA_CORES``: cores to run on, e.g. ``CAMERA_CORES=2,3`` (only available on Linux). On multi-socket machines,
+  pinning the process to cores on the same NUMA node as the network card (or the controller of the camera) avoids
+  moving every frame across sockets and keeps the frame buffers in their cache
+- ``CAMERA_PRIORITY``: with a value between 1 and 99, the process runs with real-time scheduling and is not interrupted
+  by other processes. It needs root or CAP_SYS_NICE, otherwise the normal scheduling is kept
+- ``ZMQ_IO_THREADS``: large frames at high frame rates can saturate the single ZMQ I/O thread of a context
+- ``CAMERA_LOCAL``: with ``CAMERA_LOCAL=1`` frames go through a Unix socket instead of TCP, skipping the network stack
+  when both ends run on the same computer
+"""
+import os
+
+import zmq
+
+LOCAL_ADDRESS = 'ipc:///tmp/camera'
+
+
+def setup_process(realtime=True):
+    """ Applies ``CAMERA_CORES`` and, if realtime is True, ``CAMERA_PRIORITY`` to this process. """
+    if 'CAMERA_CORES' in os.environ and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, {int(core) for core in os.environ['CAMERA_CORES'].split(',')})
+    if realtime and 'CAMERA_PRIORITY' in os.environ and hasattr(os, 'sched_setscheduler'):
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(int(os.environ['CAMERA_PRIORITY'])))
+        except PermissionError:
+            print('Not allowed to use real-time scheduling, CAMERA_PRIORITY is ignored')
+
+
+def create_context():
+    """ Returns a ZMQ context with ``ZMQ_IO_THREADS`` I/O threads. """
+    return zmq.Context(io_threads=int(os.environ.get('ZMQ_IO_THREADS', 1)))
+
+
+def camera_address(tcp_address):
+    """ Returns the address to bind or connect to, tcp_address unless ``CAMERA_LOCAL=1``. """
+    return LOCAL_ADDRESS if os.environ.get('CAMERA_LOCAL') == '1' else tcp_address
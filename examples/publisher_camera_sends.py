@@ -1,25 +1,88 @@
+import struct
+from threading import Event, Thread
+from time import perf_counter_ns, sleep
+
 import zmq
+from experimentor.lib.frame_ring import FrameRing
 from experimentor.models.devices.cameras.basler.basler import BaslerCamera
 
+from camera_setup import camera_address, create_context, setup_process
+
+# Cores and scheduling are set with environment variables, see camera_setup.py
+setup_process()
 
 cam = BaslerCamera('p')
 cam.initialize()
 
-ctx = zmq.Context()
+ctx = create_context()
 publisher = ctx.socket(zmq.PUB)
-publisher.bind('tcp://*:1234')
+# PUB drops frames for subscribers that fall behind, only a few frames are kept per subscriber
+publisher.setsockopt(zmq.SNDHWM, 4)
+publisher.setsockopt(zmq.LINGER, 0)
+# A larger kernel buffer lets each frame be transferred in fewer system calls
+publisher.setsockopt(zmq.SNDBUF, 8 << 20)
+publisher.setsockopt(zmq.TCP_KEEPALIVE, 1)  # A subscriber that disappears without closing the connection is detected
+publisher.bind(camera_address('tcp://*:1234'))
+
+# The camera is read in this thread and the frames are sent from another one, a slow network does not stop the camera
+ring = FrameRing()
+done = Event()
+
+
+# Frames are sent in batches of consecutive frames, preceded by a fixed binary header: dtype (e.g. b'<u2'), whether the
+# frames are Fortran ordered, the number of frames, their shape and the sequence number of the first frame, that lets
+# the receiver detect dropped frames. Small frames are then sent several at a time, instead of one system call each
+HEADER = struct.Struct('<4s?xHIIQ')
+MAX_BATCH = 16
+
+
+def send_frames():
+    seq = 0
+    while not done.is_set():
+        batch = ring.get_batch(MAX_BATCH)
+        if batch is None:
+            sleep(.001)
+            continue
+        # Frames are read transposed (Fortran ordered), they are sent as they are in memory, without
+        # pickling or copying, and the header tells the receiver how to rebuild them
+        fortran = batch[0].flags.f_contiguous and not batch[0].flags.c_contiguous
+        # Consecutive slots are contiguous in memory, reversing the axes of each frame gives that block of memory
+        block = batch.transpose(0, 2, 1) if fortran else batch
+        header = HEADER.pack(batch.dtype.str.encode(), fortran, len(batch), *batch.shape[1:], seq)
+        tracker = publisher.send_multipart([header, block], copy=False, track=True)
+        seq += len(batch)
+        tracker.wait()  # ZMQ reads from the slots, they can be reused only after the frames are out
+        ring.release(len(batch))
+
+
+sender = Thread(target=send_frames)
+sender.start()
 
+shape = (cam.width, cam.height)  # Frames are read transposed
 
 i = 0
+REPORT_INTERVAL = 500_000_000  # ns
+t0 = perf_counter_ns()
+next_report = t0 + REPORT_INTERVAL
 while True:
     try:
         cam.trigger_camera()
-        ans = cam.read_camera()[0]
-        publisher.send(ans, 0, copy=True, track=False)
+        # The frame is written straight into a free slot of the ring, without intermediate arrays
+        slot = ring.claim(shape, cam.current_dtype, fortran=True)
+        if slot is None:
+            cam.read_camera()  # The ring is full, the frame is discarded
+            continue
+        if cam.read_camera_into(slot):
+            ring.commit()
         i+=1
-        print(f'Sent {i} frames', end='\r')
+        now = perf_counter_ns()
+        if now >= next_report:  # Printing every frame would slow down the loop
+            print(f'Read {i} frames, {i*1e9/(now-t0):.1f} fps, {ring.dropped} dropped', end='\r')
+            next_report = now + REPORT_INTERVAL
     except KeyboardInterrupt:
         break
 
+done.set()
+sender.join()
 cam.finalize()
-publisher.close()
\ No newline at end of file
+publisher.close()
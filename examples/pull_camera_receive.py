@@ -1,15 +1,47 @@
-from time import perf_counter, time
+import struct
+from time import perf_counter_ns
 
+import numpy as np
 import zmq
 
-ctx = zmq.Context()
+from camera_setup import camera_address, create_context, setup_process
+
+# Cores are set with environment variables, see camera_setup.py. Real-time scheduling is only for the camera side
+setup_process(realtime=False)
+
+ctx = create_context()
 pull = ctx.socket(zmq.PULL)
-pull.connect('tcp://192.168.0.100:1234')
+pull.setsockopt(zmq.RCVHWM, 4)  # Frames beyond this stay with the sender, which then applies backpressure
+# A larger kernel buffer lets each frame be transferred in fewer system calls
+pull.setsockopt(zmq.RCVBUF, 8 << 20)
+pull.setsockopt(zmq.TCP_KEEPALIVE, 1)
+pull.setsockopt(zmq.LINGER, 0)  # Closing the socket never waits for pending messages
+pull.connect(camera_address('tcp://192.168.0.100:1234'))
 
+# Header sent before every batch of frames, see push_camera_sends.py
+HEADER = struct.Struct('<4s?BHIIQ')
 
 i = 0
-t0 = time()
+dropped = 0
+last_seq = -1
+REPORT_INTERVAL = 500_000_000  # ns
+t0 = perf_counter_ns()
+next_report = t0 + REPORT_INTERVAL
 while True:
-    i += 1
-    data = pull.recv(flags=0, copy=True, track=False)
-    print(f'Got {i} frames, {i/(time()-t0)} fps', end='\r')
+    header, msg = pull.recv_multipart(copy=False)
+    dtype, fortran, shift, count, height, width, seq = HEADER.unpack(header.buffer)
+    data = np.frombuffer(msg.buffer, dtype=dtype.rstrip(b'\0').decode())
+    # Each of the frames is data[j], with shape (height, width)
+    if fortran:
+        data = data.reshape((count, width, height)).transpose(0, 2, 1)
+    else:
+        data = data.reshape((count, height, width))
+    # With shift > 0 the sender reduced the frames to 8 bits. They are good for displaying as they are, the original
+    # scale (without the lowest bits) is np.left_shift(data, shift, dtype=np.uint16)
+    i += count
+    dropped += seq - last_seq - 1
+    last_seq = seq + count - 1
+    now = perf_counter_ns()
+    if now >= next_report:  # Printing every frame would slow down the loop
+        print(f'Got {i} frames, {i*1e9/(now-t0):.1f} fps, {dropped} dropped', end='\r')
+        next_report = now + REPORT_INTERVAL
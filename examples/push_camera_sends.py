@@ -1,10 +1,19 @@
-from time import perf_counter, time
+import os
+import struct
+from threading import Event, Thread
+from time import perf_counter_ns, sleep
 
+import numpy as np
 import zmq
 
 from experimentor import Q_
+from experimentor.lib.frame_ring import FrameRing
 from experimentor.models.devices.cameras.basler.basler import BaslerCamera
 
+from camera_setup import camera_address, create_context, setup_process
+
+# Cores and scheduling are set with environment variables, see camera_setup.py
+setup_process()
 
 cam = BaslerCamera('p')
 cam.initialize()
@@ -12,21 +21,93 @@ cam.initialize()
 cam.exposure = Q_('10ms')
 cam.ROI = ((300, 100), (300,100))
 
-context = zmq.Context()
+context = create_context()
 pusher = context.socket(zmq.PUSH)
-pusher.bind(f"tcp://*:1234")
+# Only a few frames are queued: when the receiver is slow, the sender blocks and the ring drops the newest frames
+# instead of ZMQ buffering stale frames without limit. Frames are queued only for connected peers and discarded on close
+pusher.setsockopt(zmq.SNDHWM, 4)
+pusher.setsockopt(zmq.IMMEDIATE, 1)
+pusher.setsockopt(zmq.LINGER, 0)
+# A larger kernel buffer lets each frame be transferred in fewer system calls
+pusher.setsockopt(zmq.SNDBUF, 8 << 20)
+pusher.setsockopt(zmq.TCP_KEEPALIVE, 1)  # A receiver that disappears without closing the connection is detected
+pusher.bind(camera_address('tcp://*:1234'))
+
+# The camera is read in this thread and the frames are sent from another one, a slow network does not stop the camera
+ring = FrameRing()
+done = Event()
+
+
+# Frames are sent in batches of consecutive frames, preceded by a fixed binary header: dtype (e.g. b'<u2'), whether the
+# frames are Fortran ordered, the number of bits dropped from each pixel (see CAMERA_8BIT_SHIFT), the number of frames,
+# their shape and the sequence number of the first frame, that lets the receiver detect dropped frames. Small frames
+# are then sent several at a time, instead of one system call each
+HEADER = struct.Struct('<4s?BHIIQ')
+MAX_BATCH = 16
+
+# When the receiver only needs 8 bits per pixel (e.g. for displaying the frames), 12 or 16-bit frames can be shifted
+# down before sending them, halving the data that goes through the network. Set CAMERA_8BIT_SHIFT to the number of bits
+# to drop, e.g. 4 for Mono12 or 8 for Mono16. The receiver can shift the pixels back up if it needs the original scale
+SHIFT = int(os.environ.get('CAMERA_8BIT_SHIFT', 0))
+
+
+def send_frames():
+    seq = 0
+    reduced = None  # Preallocated with the first batch when the frames are shifted to 8 bits
+    while not done.is_set():
+        batch = ring.get_batch(MAX_BATCH)
+        if batch is None:
+            sleep(.001)
+            continue
+        count = len(batch)
+        # Frames are read transposed (Fortran ordered), they are sent as they are in memory, without
+        # pickling or copying, and the header tells the receiver how to rebuild them
+        fortran = batch[0].flags.f_contiguous and not batch[0].flags.c_contiguous
+        # Consecutive slots are contiguous in memory, reversing the axes of each frame gives that block of memory
+        block = batch.transpose(0, 2, 1) if fortran else batch
+        shift = SHIFT if block.itemsize > 1 else 0
+        if shift:
+            if reduced is None:
+                reduced = np.empty((MAX_BATCH, ) + block.shape[1:], dtype=np.uint8)
+            # The shifted frames are written to their own buffer, the slots can be given back to the camera right away
+            block = np.right_shift(block, shift, out=reduced[:count], casting='unsafe')
+            ring.release(count)
+        header = HEADER.pack(block.dtype.str.encode(), fortran, shift, count, *batch.shape[1:], seq)
+        tracker = pusher.send_multipart([header, block], copy=False, track=True)
+        seq += count
+        tracker.wait()  # ZMQ reads from the buffer, it can be reused only after the frames are out
+        if not shift:
+            ring.release(count)
+
+
+sender = Thread(target=send_frames)
+sender.start()
+
+shape = (cam.width, cam.height)  # Frames are read transposed
 
-t0 = time()
+REPORT_INTERVAL = 500_000_000  # ns
+t0 = perf_counter_ns()
+next_report = t0 + REPORT_INTERVAL
 i = 0
 while True:
     try:
         cam.trigger_camera()
-        ans = cam.read_camera()[0]
-        pusher.send(ans, 0, copy=True, track=False)
+        # The frame is written straight into a free slot of the ring, without intermediate arrays
+        slot = ring.claim(shape, cam.current_dtype, fortran=True)
+        if slot is None:
+            cam.read_camera()  # The ring is full, the frame is discarded
+            continue
+        if cam.read_camera_into(slot):
+            ring.commit()
         i += 1
-        print(f'Sent {i} frames, {i/(time()-t0)} fps', end='\r')
+        now = perf_counter_ns()
+        if now >= next_report:  # Printing every frame would slow down the loop
+            print(f'Read {i} frames, {i*1e9/(now-t0):.1f} fps, {ring.dropped} dropped', end='\r')
+            next_report = now + REPORT_INTERVAL
     except KeyboardInterrupt:
         break
 
+done.set()
+sender.join()
 pusher.close()
 cam.finalize()
@@ -1,19 +1,51 @@
-from time import sleep
+import struct
+from time import perf_counter_ns
 
+import numpy as np
 import zmq
 
+from camera_setup import camera_address, create_context, setup_process
 
-ctx = zmq.Context()
+# Cores are set with environment variables, see camera_setup.py. Real-time scheduling is only for the camera side
+setup_process(realtime=False)
+
+ctx = create_context()
 sub = ctx.socket(zmq.SUB)
-sub.connect('tcp://192.168.0.100:1234')
+# Only a few frames are queued. Once the queue is full new frames are dropped, therefore a slow loop gets the oldest
+# frames and the gaps show up as dropped frames. CONFLATE (keeping only the latest frame) can't be used because every
+# frame comes with a header (multipart)
+sub.setsockopt(zmq.RCVHWM, 4)
+# A larger kernel buffer lets each frame be transferred in fewer system calls
+sub.setsockopt(zmq.RCVBUF, 8 << 20)
+sub.setsockopt(zmq.TCP_KEEPALIVE, 1)
+sub.setsockopt(zmq.LINGER, 0)  # Closing the socket never waits for pending messages
+sub.connect(camera_address('tcp://192.168.0.100:1234'))
 sub.setsockopt(zmq.SUBSCRIBE, b"")
 
+# Header sent before every batch of frames, see publisher_camera_sends.py
+HEADER = struct.Struct('<4s?xHIIQ')
+
 i = 0
+dropped = 0
+last_seq = -1
+REPORT_INTERVAL = 500_000_000  # ns
+t0 = perf_counter_ns()
+next_report = t0 + REPORT_INTERVAL
 while True:
-    event = sub.poll(0)
-    if not event:
-        sleep(.005)
+    if not sub.poll(50):  # Blocks until a frame arrives, instead of sleeping a fixed time between checks
         continue
-    i += 1
-    data = sub.recv(flags=0, copy=True, track=False)
-    print(f'Got {i} frames', end='\r')
+    header, msg = sub.recv_multipart(copy=False)
+    dtype, fortran, count, height, width, seq = HEADER.unpack(header.buffer)
+    data = np.frombuffer(msg.buffer, dtype=dtype.rstrip(b'\0').decode())
+    # Each of the frames is data[j], with shape (height, width)
+    if fortran:
+        data = data.reshape((count, width, height)).transpose(0, 2, 1)
+    else:
+        data = data.reshape((count, height, width))
+    i += count
+    dropped += seq - last_seq - 1  # PUB drops frames when this subscriber falls behind
+    last_seq = seq + count - 1
+    now = perf_counter_ns()
+    if now >= next_report:  # Printing every frame would slow down the loop
+        print(f'Got {i} frames, {i*1e9/(now-t0):.1f} fps, {dropped} dropped', end='\r')
+        next_report = now + REPORT_INTERVAL
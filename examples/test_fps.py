@@ -1,21 +1,36 @@
-from time import time
+from time import perf_counter_ns
+
+import numpy as np
 
 from experimentor import Q_
 from experimentor.models.devices.cameras.basler.basler import BaslerCamera
 
+from camera_setup import setup_process
+
+# Cores and scheduling are set with environment variables, see camera_setup.py
+setup_process()
 
 cam = BaslerCamera('p')
 cam.initialize()
 
 cam.exposure = Q_('10ms')
 
-t0 = time()
+# The same array is reused for every frame, frames are read transposed, therefore it is Fortran ordered
+ans = np.empty((cam.width, cam.height), dtype=cam.current_dtype, order='F')
+
+REPORT_INTERVAL = 500_000_000  # ns
+t0 = perf_counter_ns()
+next_report = t0 + REPORT_INTERVAL
 i = 0
 while True:
     try:
         cam.trigger_camera()
-        ans = cam.read_camera()[0]
-        print(f'Acquired {i} frames, {i/(time()-t0)} fps', end='\r')
+        if cam.read_camera_into(ans):
+            i += 1
+        now = perf_counter_ns()
+        if now >= next_report:  # Printing every frame would slow down the loop
+            print(f'Acquired {i} frames, {i*1e9/(now-t0):.1f} fps', end='\r')
+            next_report = now + REPORT_INTERVAL
     except KeyboardInterrupt:
         break
 
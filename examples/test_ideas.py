@@ -1,4 +1,6 @@
 class Procedure:
+    __slots__ = ('fsetup', 'frun', 'fstart', 'ffinalize', 'kwargs', 'name', 'owner', 'dispatch')
+
     def __init__(self,
                  fsetup=None,
                  frun=None,
@@ -12,6 +14,17 @@ class Procedure:
         self.fstart = fstart
         self.ffinalize = ffinalize
         self.kwargs = kwargs
+        self.dispatch = self._compile(fsetup, fstart, frun)
+
+    @staticmethod
+    def _compile(fsetup, fstart, frun):
+        # The steps are fixed once the procedure is built, they are bound as defaults (fast locals) of a single function
+        # instead of being looked up on the procedure at every call
+        def dispatch(instance, *args, _setup=fsetup, _start=fstart, _run=frun, **kwargs):
+            _setup(instance, *args, **kwargs)
+            _start(instance, *args, **kwargs)
+            _run(instance, *args, **kwargs)
+        return dispatch
 
     def __set_name__(self, owner, name):
         self.name = name
@@ -25,29 +38,37 @@ class Procedure:
     def __get__(self, instance, owner):
         if instance is None:
             return self
-        self.instance = instance
-        return instance._procedures[self.name]
+        # Procedure is a data descriptor, so the bound procedure stored under the same name never shadows it
+        bound = instance.__dict__.get(self.name)
+        if bound is None:
+            bound = instance.__dict__[self.name] = _BoundProcedure(self, instance)
+        return bound
 
     def __set__(self, instance, value):
         raise AttributeError('You can\'t set a Procedure')
 
     def setup(self, fsetup):
-        print('Setting Up')
         return type(self)(fsetup, self.frun, self.fstart, self.ffinalize, **self.kwargs)
 
     def run(self, frun):
-        print('Running')
         return type(self)(self.fsetup, frun, self.fstart, self.ffinalize, **self.kwargs)
 
     def start(self, fstart):
-        print('Starting')
         return type(self)(self.fsetup, self.frun, fstart, self.ffinalize, **self.kwargs)
 
+    def __call__(self, instance, *args, **kwargs):
+        self.dispatch(instance, *args, **kwargs)
+
+
+class _BoundProcedure:
+    __slots__ = ('dispatch', 'instance')
+
+    def __init__(self, proc, instance):
+        self.dispatch = proc.dispatch
+        self.instance = instance
+
     def __call__(self, *args, **kwargs):
-        print('Running on', self.instance, id(self.instance))
-        self.fsetup(self.instance, *args, **kwargs)
-        self.fstart(self.instance, *args, **kwargs)
-        self.frun(self.instance, *args, **kwargs)
+        self.dispatch(self.instance, *args, **kwargs)
 
 
 class Experiment:
@@ -1,43 +1,141 @@
+import os
+import struct
+from collections import deque
+from multiprocessing import Process
+from multiprocessing.shared_memory import SharedMemory
+from threading import Thread
 from time import sleep
 
+import numpy as np
+import zmq
+
 from experimentor import Q_
 from experimentor.config import settings
-from experimentor.core.publisher import Publisher, Listener
+from experimentor.core.publisher import Publisher
+from experimentor.core.pusher import Pusher
 from experimentor.core.subscriber import Subscriber
-from experimentor.models.cameras.basler import BaslerCamera
+from experimentor.models.devices.cameras.basler.basler import BaslerCamera
+
+# How frames reach the consumer:
+#   publisher: through the Publisher process, over TCP, as any other signal
+#   inproc: to a thread in this process, ZMQ passes a reference to the frame instead of copying it
+#   shm: to another process, frames are written in shared memory and only the slot number goes through ZMQ
+TRANSPORT = os.environ.get('THROUGHPUT_TRANSPORT', 'inproc')
+FRAMES = 100
+
+
+def func(frame): print(frame.shape)
+
 
 cam = BaslerCamera('da')
 cam.initialize()
-cam.clear_ROI()
-cam.set_acquisition_mode(cam.MODE_CONTINUOUS)
-cam.set_ROI((1, 100), (1, 100))
-cam.set_exposure(Q_('10ms'))
+cam.acquisition_mode = cam.MODE_CONTINUOUS
+cam.ROI = ((1, 100), (1, 100))
+cam.exposure = Q_('10ms')
+shape = (cam.width, cam.height)  # Frames are read transposed
 
 
-publisher = Publisher(settings.GENERAL_STOP_EVENT)
-publisher.start()
+def consume_inproc(context):
+    socket = context.socket(zmq.PAIR)
+    socket.connect('inproc://frames')
+    while True:
+        header, data = socket.recv_multipart(copy=False)
+        if not header.bytes:
+            break
+        dtype, width, height = header.bytes.decode().split(',')
+        func(np.frombuffer(data, dtype=dtype).reshape((int(height), int(width))).T)
+    socket.close()
 
-listener = Listener()
 
+# Slot in shared memory and sequence number of the frame. An empty message stops the consumer
+SHM_HEADER = struct.Struct('<IQ')
+SHM_SLOTS = 8
 
-def func(frame): print(len(frame))
 
+def consume_shm(name, shape, dtype):
+    shm = SharedMemory(name=name)
+    frames = np.ndarray((SHM_SLOTS, ) + shape[::-1], dtype=dtype, buffer=shm.buf)
+    socket = zmq.Context().socket(zmq.PAIR)
+    socket.connect('ipc:///tmp/frames')
+    while True:
+        message = socket.recv()
+        if not message:
+            break
+        slot, seq = SHM_HEADER.unpack(message)
+        func(frames[slot].T)
+        socket.send(SHM_HEADER.pack(slot, seq))  # The slot can be reused by the camera
+    socket.close()
+    del frames
+    shm.close()
 
-subscriber = Subscriber(func, 'frame')
-subscriber.start()
-
-sleep(2)
 
 cam.trigger_camera()
 i = 0
-for _ in range(100):
-    frames = cam.read_camera()
-    i += len(frames)
-    listener.publish(frames, 'frame')
-    sleep(.01)
+if TRANSPORT == 'publisher':
+    publisher = Publisher(settings.GENERAL_STOP_EVENT)
+    publisher.start()
+    subscriber = Subscriber(func, f'tcp://127.0.0.1:{settings.PUBLISHER_PUBLISH_PORT}', 'frame')
+    pusher = Pusher()
+    sleep(2)
+    for _ in range(FRAMES):
+        frames = cam.read_camera()
+        i += len(frames)
+        for frame in frames:
+            pusher.publish(frame, 'frame')
+        sleep(.01)
+    subscriber.stop()
+    publisher.stop()
+    pusher.finish()
 
-print(f'Acquired {i} frames')
+elif TRANSPORT == 'inproc':
+    context = zmq.Context()
+    socket = context.socket(zmq.PAIR)
+    socket.bind('inproc://frames')  # With inproc, the bind must happen before the connect
+    consumer = Thread(target=consume_inproc, args=(context, ))
+    consumer.start()
+    for _ in range(FRAMES):
+        frames = cam.read_camera()
+        i += len(frames)
+        for frame in frames:
+            # read_camera returns new arrays, they are not modified after sending them without copying
+            header = f'{frame.dtype.str},{frame.shape[0]},{frame.shape[1]}'.encode()
+            socket.send_multipart([header, frame.T], copy=False)
+        sleep(.01)
+    socket.send_multipart([b'', b''])
+    consumer.join()
+    socket.close()
 
-subscriber.stop()
-publisher.stop()
-listener.finish()
\ No newline at end of file
+elif TRANSPORT == 'shm':
+    dtype = np.dtype(cam.current_dtype)
+    shm = SharedMemory(create=True, size=SHM_SLOTS * shape[0] * shape[1] * dtype.itemsize)
+    frames = np.ndarray((SHM_SLOTS, ) + shape[::-1], dtype=dtype, buffer=shm.buf)
+    socket = zmq.Context().socket(zmq.PAIR)
+    socket.bind('ipc:///tmp/frames')
+    consumer = Process(target=consume_shm, args=(shm.name, shape, dtype))
+    consumer.start()
+    free_slots = deque(range(SHM_SLOTS))
+    dropped = 0
+    for _ in range(FRAMES):
+        while socket.poll(0):
+            free_slots.append(SHM_HEADER.unpack(socket.recv())[0])
+        if not free_slots:
+            cam.read_camera()  # The consumer is lagging, the frames are discarded
+            dropped += 1
+            continue
+        slot = free_slots.popleft()
+        if cam.read_camera_into(frames[slot].T):  # Straight from the camera to shared memory
+            socket.send(SHM_HEADER.pack(slot, i))
+            i += 1
+        else:
+            free_slots.append(slot)
+        sleep(.01)
+    socket.send(b'')
+    consumer.join()
+    socket.close()
+    del frames
+    shm.close()
+    shm.unlink()
+    print(f'Dropped {dropped} reads')
+
+print(f'Acquired {i} frames')
+cam.finalize()
@@ -9,7 +9,14 @@ Q_ = ureg.Quantity
 
 general_stop_event = Event()  # This event is the last resource to stop threads and processes
 
-from experimentor.views.camera.camera_viewer_widget import CameraViewerWidget as CameraView
+
+def __getattr__(name):
+    # The camera viewer pulls in Qt and pyqtgraph, which are slow to import and not needed when running headless
+    if name == 'CameraView':
+        from experimentor.views.camera.camera_viewer_widget import CameraViewerWidget as CameraView
+        return CameraView
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
 
 __all__ = [
     'config',
@@ -17,21 +17,20 @@ import os
 
 from experimentor.config import global_settings
 
+_GLOBAL_SETTINGS = {setting: value for setting, value in vars(global_settings).items() if setting.isupper()}
+
 
 class Settings:
     """ Loads the global parameters and overrides them with those specified in the settings module of the project.
     """
     def __init__(self, settings_module):
-        for setting in dir(global_settings):
-            if setting.isupper():
-                setattr(self, setting, getattr(global_settings, setting))
+        self.__dict__.update(_GLOBAL_SETTINGS)
 
         self.SETTINGS_MODULE = settings_module
 
         modifications = importlib.import_module(self.SETTINGS_MODULE)
-        for setting in dir(modifications):
-            if setting.isupper():
-                setattr(self, setting, getattr(modifications, setting))
+        self.__dict__.update(
+            {setting: value for setting, value in vars(modifications).items() if setting.isupper()})
 
 
 settings = Settings(os.environ.get('EXPERIMENTOR_SETTINGS_MODULE', 'experimentor.config.global_settings'))
@@ -23,8 +23,26 @@ EXPERIMENT_MODEL_INIT = None
 START_WINDOW = 'experimentor.views.DataViewWidget'
 
 PUBLISHER_EXIT_KEYWORD = 'stop'
+PUBLISHER_CONTROL_PORT = 5559  # Only reachable from this computer, used to stop the publisher
+# Pushers reach the publisher through this Unix socket instead of TCP, set it to None to always use TCP. Not available
+# on Windows, where TCP is always used
+PUBLISHER_PULL_IPC = 'ipc:///tmp/experimentor-publisher'
+# Methods connected to the signals of a model in the same process receive them through ZMQ's in-memory transport
+# instead of TCP. Set it to False to always use TCP
+SIGNALS_INPROC = True
+# Messages queued on each socket before senders block (PUSH) or drop them (PUB), and size of the kernel buffers. Bursts
+# of large arrays need more than the defaults of ZMQ and the operating system
+ZMQ_HWM = 10000
+ZMQ_BUFFER_SIZE = 4 << 20
+# All the sockets of a process share one ZMQ context. As a rule of thumb, each I/O thread moves about 1 GB/s
+ZMQ_IO_THREADS = 1
 SUBSCRIBER_EXIT_KEYWORD = 'stop'
 
 GENERAL_STOP_EVENT = Event()
 
 PUBLISHER_READY = True
+
+# Pushers place numpy arrays of at least PUSHER_SHARED_MEMORY_THRESHOLD bytes in shared memory instead of sending them
+# through the publisher. Only for setups in which all the subscribers run on the same computer
+PUSHER_SHARED_MEMORY = False
+PUSHER_SHARED_MEMORY_THRESHOLD = 64 * 1024
@@ -12,6 +12,7 @@ from pint.errors import UndefinedUnitError
 
 from experimentor import Q_
 from experimentor.core.exceptions import DuplicatedParameter
+from experimentor.lib.general_functions import to_quantity
 
 
 class Parameter:
@@ -23,11 +24,11 @@ class Parameter:
     def __set_name__(self, owner, name):
         self.name = name
         if not hasattr(owner, '_parameters'):
-            setattr(owner, '_parameters', [])
+            setattr(owner, '_parameters', {})
 
         if name in owner._parameters:
             raise DuplicatedParameter(f'{name} already exists in {owner}')
-        owner._parameters.append(name)
+        owner._parameters[name] = self
 
     def __init__(self, units=None, ui_class=None):
         self._value = None
@@ -42,6 +43,11 @@ class Parameter:
                 except UndefinedUnitError:
                     self.units = None
 
+        if self.units:
+            # Numbers are scaled by hand instead of multiplying by self.units, which is much slower in Pint
+            self._scale = self.units.magnitude
+            self._unit = self.units.units
+
         self.ui_class = ui_class
 
     def __get__(self, instance, owner):
@@ -52,9 +58,9 @@ class Parameter:
             if isinstance(value, Q_):
                 value = value.to(self.units)
             elif isinstance(value, str):
-                value = Q_(value).to(self.units)
+                value = to_quantity(value).to(self.units)
             elif isinstance(value, Number):
-                value = value * self.units
+                value = Q_(value * self._scale, self._unit)
             else:
                 raise Exception(f'Cant set {self.name} to {value}')
 
@@ -12,8 +12,10 @@ class MetaProcess(type):
         # Create class
         super(MetaProcess, cls).__init__(name, bases, attrs)
 
-        # Initialize fresh instance storage
+        # Initialize fresh instance storage. _all_instances also holds the instances of every subclass, so recursive
+        # lookups don't need to walk the tree of subclasses
         cls._instances = weakref.WeakSet()
+        cls._all_instances = weakref.WeakSet()
 
     def __call__(cls, *args, **kwargs):
         # Create instance (calls __init__ and __new__ methods)
@@ -22,28 +24,30 @@ class MetaProcess(type):
         # Store weak reference to instance. WeakSet will automatically remove
         # references to objects that have been garbage collected
         cls._instances.add(proc)
+        for base in cls.__mro__:
+            if isinstance(base, MetaProcess):
+                base._all_instances.add(proc)
 
         return proc
 
     def get_instances(cls, recursive=False):
         """Get all instances of this class in the registry. If recursive=True
         search subclasses recursively"""
-        instances = list(cls._instances)
         if recursive:
-            for Child in cls.__subclasses__():
-                instances += Child.get_instances(recursive=recursive)
-
-        # Remove duplicates from multiple inheritance.
-        return list(set(instances))
+            return list(cls._all_instances)
+        return list(cls._instances)
 
 
 class ExperimentorProcess(Process, metaclass=MetaProcess):
+    # Shared by all instances, get_logger sets the level (and clears the cache of the logging module) on every call
+    logger = get_logger()
+
     def __init__(self, *args, **kwargs):
         super(ExperimentorProcess, self).__init__()
-        self.logger = get_logger()
 
 
 class ExperimentorThread(Thread, metaclass=MetaProcess):
+    logger = get_logger()
+
     def __init__(self, *args, **kwargs):
         super(ExperimentorThread, self).__init__(args, kwargs)
-        self.logger = get_logger()
@@ -7,20 +7,20 @@ Publishers are responsible for broadcasting the message over the ZMQ PUB/SUB arc
 continuously on a separated process and grabs elements from a queue, which in turn are sent through a socket to any
 other processes listening.
 
-.. TODO:: In the current implementation, data is serialized for being added to a Queue, then deserialized by the
-    publisher and serialized again to be sent. These three steps could be simplify into one if, for example, one assumes
-    that objects where pickled. There is also a possibility of assuming numpy arrays and using a zero-copy strategy.
+Messages are forwarded by libzmq itself (:func:`zmq.proxy_steerable`), without going through Python: the parts received
+from the pushers (topic, metadata and data) are sent to the subscribers as the same ZMQ frames. The publisher is stopped
+by sending ``TERMINATE`` to its control socket, on ``PUBLISHER_CONTROL_PORT``, see :meth:`Publisher.stop`.
 
 :copyright:  Aquiles Carattino
 :license: MIT, see LICENSE for more details
 """
 import atexit
+import os
 from time import sleep
 
 import zmq
 
 from experimentor.config import settings
-from experimentor.core.pusher import Pusher
 from experimentor.lib.log import get_logger
 from .meta import MetaProcess, ExperimentorProcess
 
@@ -46,16 +46,15 @@ class Publisher(ExperimentorProcess, metaclass=MetaProcess):
         """
         self.running = True
         logger.info('Publisher initializing')
-        context = zmq.Context()
+        context = zmq.Context.instance(io_threads=settings.ZMQ_IO_THREADS)
         publisher = context.socket(zmq.PUB)
+        publisher.setsockopt(zmq.SNDHWM, settings.ZMQ_HWM)
+        publisher.setsockopt(zmq.SNDBUF, settings.ZMQ_BUFFER_SIZE)
         try:
             publisher.bind(f"tcp://*:{settings.PUBLISHER_PUBLISH_PORT}")
         except zmq.ZMQError:
             logger.error('Por already in use. Trying to close and reconnect')
-            temp = context.socket(zmq.PUSH)
-            temp.connect(f"tcp://127.0.0.1:{settings.PUBLISHER_PULL_PORT}")
-            temp.send_string("", zmq.SNDMORE)
-            temp.send_pyobj(settings.PUBLISHER_EXIT_KEYWORD)
+            send_command(b'TERMINATE')
             sleep(1)
             logger.info('Retrying to open the publisher')
             try:
@@ -64,40 +63,42 @@ class Publisher(ExperimentorProcess, metaclass=MetaProcess):
                 raise
 
         listener = context.socket(zmq.PULL)
+        listener.setsockopt(zmq.RCVHWM, settings.ZMQ_HWM)
+        listener.setsockopt(zmq.RCVBUF, settings.ZMQ_BUFFER_SIZE)
         listener.bind(f"tcp://127.0.0.1:{settings.PUBLISHER_PULL_PORT}")
+        if settings.PUBLISHER_PULL_IPC and os.name == 'posix':
+            listener.bind(settings.PUBLISHER_PULL_IPC)  # Pushers on this computer skip the TCP stack
+
+        # The proxy answers commands on the control socket, therefore it must be able to send as well as receive
+        control = context.socket(zmq.PAIR)
+        control.bind(f"tcp://127.0.0.1:{settings.PUBLISHER_CONTROL_PORT}")
 
-        sleep(2)  # To give time to binding to the given port
-        i = 0
         logger.info('Publisher ready to handle events')
-        while not self._event.is_set():
-            topic = listener.recv_string()
-            logger.debug(f"Got data on topic {topic}")
-            metadata = listener.recv_json(flags=0)
-            publisher.send_string(topic, zmq.SNDMORE)
-            publisher.send_json(metadata, 0 | zmq.SNDMORE)
-            if metadata.get('numpy', False):
-                data = listener.recv(flags=0, copy=True, track=False)
-                publisher.send(data, 0, copy=True, track=False)
-            else:
-                data = listener.recv_pyobj()
-                publisher.send_pyobj(data)
-            i += 1
-            logger.debug(data)
-
-            if topic == "":
-                logger.info('Got Broad Topic')
-                if isinstance(data, str) and data == settings.PUBLISHER_EXIT_KEYWORD:
-                    logger.debug('Stopping the Publisiher')
-                    self._event.set()
-        logger.info('Publisher Stopped')
-        self.running = False
+        try:
+            # Blocks until TERMINATE arrives on the control socket
+            zmq.proxy_steerable(listener, publisher, None, control)
+        finally:
+            for socket in (listener, publisher, control):
+                socket.close(linger=0)
+            self._event.set()
+            logger.info('Publisher Stopped')
+            self.running = False
 
     def stop(self):
-        with Pusher() as pusher:
-            pusher.publish(settings.PUBLISHER_EXIT_KEYWORD)
+        send_command(b'TERMINATE')
         self.join()
 
 
+def send_command(command):
+    """ Sends a command (``TERMINATE``, ``PAUSE`` or ``RESUME``) to the control socket of the publisher running on this
+    computer.
+    """
+    socket = zmq.Context.instance().socket(zmq.PAIR)
+    socket.connect(f"tcp://127.0.0.1:{settings.PUBLISHER_CONTROL_PORT}")
+    socket.send(command)
+    socket.close(linger=1000)  # Gives up if there is no publisher listening
+
+
 def start_publisher():
     """Wrapper function to start the publisher. It takes care of checking that there is only one publisher running by
     storing it in the settings.
@@ -10,17 +10,22 @@
     pushers, but only one publisher. In other words, this is a fan-in type of architecture.
 """
 import atexit
+import os
+from itertools import count
 from threading import RLock
-from time import sleep
 
 import numpy as np
 import zmq
 
 from experimentor.config import settings
+from experimentor.core.serialization import dumps_array_metadata, dumps_metadata, dumps_object, encode_topic
+from experimentor.core.shared_arrays import SharedArrayRing
 from experimentor.lib.log import get_logger
 
 logger = get_logger(__name__)
 
+OBJECT_METADATA = dumps_metadata(dict(numpy=False))  # The same for every message that is not a numpy array
+
 
 class Pusher:
     """
@@ -33,7 +38,11 @@ class Pusher:
     Parameters
     ----------
     port: int
-        The port on which to connect the PUSH end. If not specified, it will grab the default value from settings
+        The port on which to connect the PUSH end. If not specified, it will connect through ``PUBLISHER_PULL_IPC`` if
+        available, or grab the default port from settings
+    shared_memory: bool
+        Whether to hand large numpy arrays to subscribers through shared memory, see
+        :mod:`~experimentor.core.shared_arrays`. If not specified, it will grab the value from settings
 
     Attributes
     ----------
@@ -48,16 +57,25 @@ class Pusher:
 
     lock: RLOCK
         In case the same pusher is shared between different threads, this ensures the messages are sent in the proper
-        block
+        block. Only sending is done while holding it
     """
-    def __init__(self, port=None):
+    def __init__(self, port=None, shared_memory=None):
         self.lock = RLock()
-        context = zmq.Context()
+        if shared_memory is None:
+            shared_memory = settings.PUSHER_SHARED_MEMORY
+        self.shared_arrays = SharedArrayRing() if shared_memory else None
+        context = zmq.Context.instance(io_threads=settings.ZMQ_IO_THREADS)
         self.pusher = context.socket(zmq.PUSH)
-        self.pusher.connect(f"tcp://127.0.0.1:{port or settings.PUBLISHER_PULL_PORT}")
-        sleep(1)
+        self.pusher.setsockopt(zmq.SNDHWM, settings.ZMQ_HWM)
+        self.pusher.setsockopt(zmq.SNDBUF, settings.ZMQ_BUFFER_SIZE)
+        if port is None and settings.PUBLISHER_PULL_IPC and os.name == 'posix':
+            self.pusher.connect(settings.PUBLISHER_PULL_IPC)
+        else:
+            self.pusher.connect(f"tcp://127.0.0.1:{port or settings.PUBLISHER_PULL_PORT}")
+        # No need to wait for the connection, PUSH sockets queue the messages until the publisher is reachable
         self.i = 0
         self.topic_i = {}
+        self._counters = {}  # Topic: itertools.count, next() on them is atomic
         atexit.register(self.finish)
 
     def publish(self, data, topic=""):
@@ -73,35 +91,69 @@ class Pusher:
             meaning that every subscriber will receive it.
 
         """
-        with self.lock:
-            if topic in self.topic_i:
-                self.topic_i[topic] += 1
-            else:
-                self.topic_i.update({topic: 1})
-
-            if settings.PUBLISHER_READY:
-                self.pusher.send_string(topic, zmq.SNDMORE)
-                if isinstance(data, np.ndarray):
-                    meta_data = dict(
-                        numpy=True,
-                        dtype=str(data.dtype),
-                        shape=data.shape,
-                        i=self.topic_i[topic]
-                    )
-                    self.pusher.send_json(meta_data, 0 | zmq.SNDMORE)
-                    self.pusher.send(data, 0, copy=True, track=False)
-                else:
-                    meta_data = dict(
-                        numpy=False
-                    )
-                    self.pusher.send_json(meta_data, 0 | zmq.SNDMORE )
-                    self.pusher.send_pyobj(data)
+        if isinstance(data, np.ndarray):
+            self.publish_array(data, topic)
+        else:
+            self.publish_object(data, topic)
+
+    def publish_array(self, array, topic=""):
+        """ Publishes a numpy array. It skips the type check of :meth:`publish`, for topics that always carry arrays
+        (for example camera frames).
+
+        Parameters
+        ----------
+        array : numpy.ndarray
+        topic : str
+        """
+        i = self._count(topic)
+        if not settings.PUBLISHER_READY:
+            return
+
+        if self.shared_arrays is not None and array.nbytes >= settings.PUSHER_SHARED_MEMORY_THRESHOLD:
+            with self.lock:
+                # Only the location of the array is sent, subscribers read it from memory
+                meta_data = self.shared_arrays.put(array)
+                meta_data['i'] = i
+                self.pusher.send_multipart([encode_topic(topic), dumps_metadata(meta_data)])
                 self.i += 1
+            return
+
+        # The metadata only describes C-ordered arrays, others (e.g. transposed camera frames) are copied in that order
+        array = np.ascontiguousarray(array)
+        self._send([encode_topic(topic), dumps_array_metadata(array, i), array])
+
+    def publish_object(self, data, topic=""):
+        """ Publishes any Python object that can be pickled, including numpy arrays nested in it. It skips the type
+        check of :meth:`publish`.
+
+        Parameters
+        ----------
+        data
+        topic : str
+        """
+        self._count(topic)
+        if not settings.PUBLISHER_READY:
+            return
+        self._send([encode_topic(topic), OBJECT_METADATA, *dumps_object(data)])
+
+    def _count(self, topic):
+        # Counting and serializing do not need the lock, only the socket is shared between threads
+        counter = self._counters.get(topic) or self._counters.setdefault(topic, count(1))
+        i = next(counter)
+        self.topic_i[topic] = i
+        return i
+
+    def _send(self, frames):
+        with self.lock:
+            self.pusher.send_multipart(frames)
+            self.i += 1
 
     def finish(self):
         with self.lock:
             logger.info('Finishing Pusher')
             self.pusher.close()
+            if self.shared_arrays is not None:
+                self.shared_arrays.close()
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.finish()
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+    Serialization
+    =============
+    Helpers to encode the messages exchanged by pushers, the publisher and subscribers. Every message carries a small
+    metadata dictionary encoded as JSON, which at high rates takes a large share of the time spent on each message. If
+    `orjson <https://github.com/ijl/orjson>`_ is installed, it is used instead of the standard library, which is several
+    times faster. Both produce the same JSON, therefore processes with and without orjson can talk to each other. The
+    metadata of plain numpy arrays (dtype, shape and counter) is packed in a fixed binary record instead, see
+    :func:`dumps_array_metadata`.
+
+    Payloads that are not numpy arrays are pickled with protocol 5. Large buffers inside them (for example numpy arrays
+    in a dictionary or a list) are kept out of the pickle and sent as ZMQ frames of their own, therefore they are not
+    copied into the pickled bytes first.
+
+    :copyright:  Aquiles Carattino
+    :license: MIT, see LICENSE for more details
+"""
+import json
+import pickle
+import struct
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Binary metadata of numpy arrays: marker (JSON always starts with '{'), number of dimensions, dtype (e.g. b'<u2'), up to
+# 4 dimensions and the number of the message on its topic
+ARRAY_METADATA = struct.Struct('<cB8s4IQ')
+ARRAY_MARKER = b'A'
+
+
+@lru_cache(maxsize=256)
+def encode_topic(topic):
+    """ Encodes a topic to be sent as the first part of a message. Signals are emitted over and over on the same few
+    topics, therefore the encoded topics are cached.
+
+    Parameters
+    ----------
+    topic : str
+
+    Returns
+    -------
+    bytes
+    """
+    return topic.encode('utf-8')
+
+
+def dumps_metadata(metadata):
+    """ Encodes the metadata of a message as JSON.
+
+    Parameters
+    ----------
+    metadata : dict
+
+    Returns
+    -------
+    bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(metadata)
+    return json.dumps(metadata).encode()
+
+
+def dumps_array_metadata(array, i=0):
+    """ Encodes the metadata of a numpy array sent in a message: ``numpy``, ``dtype``, ``shape`` and ``i``. Arrays
+    that do not fit in the binary record (more than 4 dimensions or structured data types) are encoded as JSON.
+
+    Parameters
+    ----------
+    array : numpy.ndarray
+    i : int
+        Number of the message on its topic
+
+    Returns
+    -------
+    bytes
+    """
+    dtype = array.dtype.str
+    if array.ndim > 4 or len(dtype) > 8 or array.dtype.fields is not None:
+        return dumps_metadata(dict(numpy=True, dtype=str(array.dtype), shape=array.shape, i=i))
+    shape = array.shape + (0, ) * (4 - array.ndim)
+    return ARRAY_METADATA.pack(ARRAY_MARKER, array.ndim, dtype.encode(), *shape, i)
+
+
+def loads_metadata(buf):
+    """ Decodes metadata encoded with :func:`dumps_metadata`, :func:`dumps_array_metadata` (or with PyZMQ's
+    ``send_json``).
+
+    Parameters
+    ----------
+    buf : bytes or zmq.Frame
+        The received message, frames are read without copying them again
+
+    Returns
+    -------
+    dict
+    """
+    if not isinstance(buf, (bytes, bytearray, memoryview)):
+        buf = buf.buffer
+    if buf[:1] == ARRAY_MARKER:
+        _, ndim, dtype, *shape, i = ARRAY_METADATA.unpack(buf)
+        return dict(numpy=True, dtype=dtype.rstrip(b'\0').decode(), shape=shape[:ndim], i=i)
+    if orjson is not None:
+        return orjson.loads(buf)
+    return json.loads(bytes(buf))
+
+
+def dumps_object(obj):
+    """ Pickles an object, keeping its large buffers out-of-band.
+
+    Parameters
+    ----------
+    obj
+        Any object that can be pickled
+
+    Returns
+    -------
+    list
+        The pickled object followed by its out-of-band buffers, to be sent as consecutive parts of a multipart message
+    """
+    buffers = []
+    data = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    return [data, *buffers]
+
+
+def loads_object(frames):
+    """ Rebuilds an object pickled with :func:`dumps_object`. The out-of-band buffers are used without copying them,
+    therefore arrays in the object are read-only if the frames are.
+
+    Parameters
+    ----------
+    frames : list
+        The parts produced by :func:`dumps_object`, as bytes or zmq.Frame
+
+    Returns
+    -------
+    object
+    """
+    frames = [frame if isinstance(frame, (bytes, bytearray, memoryview)) else frame.buffer for frame in frames]
+    return pickle.loads(frames[0], buffers=frames[1:])
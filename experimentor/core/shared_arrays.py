@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+    Shared Arrays
+    =============
+    When pushers, the publisher and subscribers run on the same computer, large numpy arrays (for example camera frames)
+    don't need to travel through sockets. The pusher copies them to a block of shared memory and only the metadata needed
+    to find them (name of the block, slot, shape, etc.) is published. Subscribers read the arrays straight from memory.
+
+    Subscribers receive messages through PUB/SUB, therefore they can't tell the pusher when they are done with a slot.
+    The slots are reused in turns, and each slot starts with the sequence number of the array stored in it. The number is
+    cleared before an array is written and set after it, so a subscriber that falls so far behind that the slot was
+    reused while it was reading notices it, and the array is discarded.
+
+    :copyright:  Aquiles Carattino
+    :license: MIT, see LICENSE for more details
+"""
+import os
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from experimentor.lib.log import get_logger
+
+logger = get_logger(__name__)
+
+HEADER_SIZE = 64  # Bytes before the data of each slot, the sequence number is stored at the start. Keeps data aligned
+
+
+class SharedArrayRing:
+    """ Ring of slots in shared memory used by a pusher to hand arrays to subscribers on the same computer. The memory
+    is allocated with the first array, and allocated again if a larger array arrives.
+
+    Parameters
+    ----------
+    slots : int
+        Number of arrays kept in memory. Subscribers that lag more than this many arrays lose them
+    """
+    def __init__(self, slots=16):
+        self.slots = slots
+        self._shm = None
+        self._slot_size = 0
+        self._seq = 0
+        self._id = f'{os.getpid()}-{id(self)}'  # Identifies the ring, its block changes when it grows
+
+    def put(self, array):
+        """ Copies the array to the next slot.
+
+        Parameters
+        ----------
+        array : numpy.ndarray
+
+        Returns
+        -------
+        dict
+            Metadata that subscribers need to read the array with :func:`read_shared_array`
+        """
+        if array.nbytes > self._slot_size:
+            self._allocate(array.nbytes)
+        self._seq += 1
+        slot = self._seq % self.slots
+        offset = slot * (HEADER_SIZE + self._slot_size)
+        header = np.ndarray((1, ), dtype=np.uint64, buffer=self._shm.buf, offset=offset)
+        header[0] = 0
+        np.copyto(np.ndarray(array.shape, dtype=array.dtype, buffer=self._shm.buf, offset=offset + HEADER_SIZE), array)
+        header[0] = self._seq
+        return dict(
+            numpy=True,
+            shm=self._shm.name,
+            ring=self._id,
+            offset=offset,
+            seq=self._seq,
+            dtype=str(array.dtype),
+            shape=array.shape,
+        )
+
+    def close(self):
+        """ Frees the shared memory. Arrays not yet read by subscribers are lost. """
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def _allocate(self, nbytes):
+        self.close()
+        self._slot_size = -(-nbytes // HEADER_SIZE) * HEADER_SIZE
+        self._shm = SharedMemory(create=True, size=self.slots * (HEADER_SIZE + self._slot_size))
+        _created.add(self._shm.name)
+        logger.debug('Allocated %s bytes of shared memory in %s', self._shm.size, self._shm.name)
+
+
+_created = set()  # Names of the blocks allocated by rings of this process
+_opened = {}  # Ring: SharedMemory, the current block of each ring read by this process
+
+
+def read_shared_array(metadata, copy=True):
+    """ Copies an array stored by a :class:`SharedArrayRing` out of shared memory.
+
+    Parameters
+    ----------
+    metadata : dict
+        Metadata published together with the array, as returned by :meth:`SharedArrayRing.put`
+    copy : bool
+        If False, a read-only view of the slot is returned instead of a copy. The view changes once the pusher reuses
+        the slot, therefore it should only be used while the subscriber keeps up with the pusher
+
+    Returns
+    -------
+    numpy.ndarray or None
+        The array, or None if the pusher already reused its slot or freed the memory
+    """
+    name, ring = metadata['shm'], metadata['ring']
+    shm = _opened.get(ring)
+    if shm is None or shm.name != name:
+        if shm is not None:
+            # The ring moved to a larger block, the old one is not used anymore
+            del _opened[ring]
+            try:
+                shm.close()
+            except BufferError:
+                pass  # Arrays read without copying still use it, it is closed once they are gone
+        try:
+            shm = SharedMemory(name=name)
+        except FileNotFoundError:
+            logger.warning(f'Shared memory {name} was already freed, array discarded')
+            return None
+        if os.name == 'posix' and name not in _created:
+            # The block belongs to the pusher, this process should not free it when exiting. If the pusher runs in this
+            # process, the block stays registered so the pusher can free it
+            resource_tracker.unregister(shm._name, 'shared_memory')
+        _opened[ring] = shm
+    offset = metadata['offset']
+    header = np.ndarray((1, ), dtype=np.uint64, buffer=shm.buf, offset=offset)
+    data = np.ndarray(metadata['shape'], dtype=metadata['dtype'], buffer=shm.buf, offset=offset + HEADER_SIZE)
+    if copy:
+        data = data.copy()
+    else:
+        data.flags.writeable = False
+    if header[0] != metadata['seq']:
+        logger.warning('Array overwritten before it could be read, the subscriber is lagging')
+        return None
+    return data
@@ -1,3 +1,5 @@
+from experimentor.config import settings
+from experimentor.core.subscriber import Subscriber
 from experimentor.lib.log import get_logger
 
 
@@ -33,9 +35,47 @@ class Signal:
         For example, the owner could be a QObject and it could use the internals of Qt to emitting signals.
 
         """
-        logger.debug(f'Emitting {self.name} from {self.owner}')
+        logger.debug('Emitting %s from %s', self.name, self.owner)
         self.instance.emit(self.name, payload, **kwargs)
 
+    def connect(self, method):
+        """ Connects a method to the signal. The method runs on a :class:`~experimentor.core.subscriber.Subscriber`
+        and receives the payload every time the signal is emitted. Subscribers are stored in the owner's
+        ``_subscribers``, keyed by signal and method, therefore connecting the same method more than once has no effect.
+
+        Every connected method has its own subscriber thread, therefore slow methods do not delay each other nor the
+        model emitting the signal. Coroutine functions are also accepted, they are awaited on the subscriber's own
+        event loop.
+
+        Parameters
+        ----------
+        method : callable
+            Function, bound method or coroutine function that takes the payload of the signal as argument
+
+        Returns
+        -------
+        Subscriber
+            The subscriber running the method
+        """
+        if hasattr(method, '__self__'):
+            key = (self.name, id(method.__self__), method.__func__)
+        else:
+            key = (self.name, method)
+
+        subscribers = self.instance._subscribers
+        subscriber = subscribers.get(key)
+        if subscriber is None or not subscriber.is_alive():
+            if settings.SIGNALS_INPROC:
+                # Subscribers run in this process, using the context of the model they can skip the TCP stack
+                subscriber = Subscriber(method, self.instance.get_publisher_inproc_url(), self.name,
+                                        context=self.instance.get_context())
+            else:
+                subscriber = Subscriber(method, self.url, self.name)
+            subscribers[key] = subscriber
+        else:
+            logger.debug(f'{method} already connected to {self}')
+        return subscriber
+
     @property
     def url(self):
         return f"{self.instance.get_publisher_url()}:{self.instance.get_publisher_port()}"
@@ -7,59 +7,157 @@
     from a queue with ``Queue.get()`` is particularly slow, much slower than serializing a numpy array with
     cPickle.
 """
-from threading import Thread
-from time import sleep
+import asyncio
+from threading import Event, Thread
 
 import numpy as np
 import zmq
 
 from experimentor.config import settings
 from experimentor.core.meta import MetaProcess
-from experimentor.core.pusher import Pusher
+from experimentor.core.serialization import encode_topic, loads_metadata, loads_object
+from experimentor.core.shared_arrays import read_shared_array
 from experimentor.lib.log import get_logger
 
 logger = get_logger(__name__)
 
 
 class Subscriber(Thread, metaclass=MetaProcess):
-    def __init__(self, func, url, topic):
+    """ Thread that runs a function with the data published on a topic.
+
+    Parameters
+    ----------
+    func : callable
+        Function or coroutine function that takes the data as argument
+    url : str
+        Address of the publisher, e.g. ``tcp://localhost:5556``
+    topic : str
+        Topic to subscribe to
+    reuse_buffers : bool
+        Numpy arrays are received into two preallocated arrays used in turns, instead of a new array for every message.
+        It saves an allocation per message, but func must not keep the array beyond the next message. Only available
+        with PyZMQ versions that have ``Socket.recv_into``, otherwise it is ignored
+    copy_arrays : bool
+        If False, numpy arrays are read-only views of the received message, which are never copied. The message is kept
+        in memory for as long as the array is referenced. Arrays sent through shared memory are views of the pusher's
+        slot, which is reused once the pusher has sent as many arrays as the ring has slots
+    context : zmq.Context
+        Context in which the socket is created, by default the one shared by the whole process. Publishers bound to an
+        ``inproc://`` address can only be reached from sockets of their own context
+    """
+    def __init__(self, func, url, topic, reuse_buffers=False, copy_arrays=True, context=None):
         super(Subscriber, self).__init__()
         logger.info(f'Starting subscriber for {func.__name__} on topic {topic}')
         self.func = func
-        context = zmq.Context()
+        self.topic = topic
+        self.reuse_buffers = reuse_buffers and hasattr(zmq.Socket, 'recv_into')
+        self._buffers = {}  # (dtype, shape): the two arrays used in turns
+        self.copy_arrays = copy_arrays
+        self._stop_event = Event()
+        # By default all subscribers share one context, and therefore one ZMQ I/O thread, each callback still runs on
+        # its own thread
+        if context is None:
+            context = zmq.Context.instance(io_threads=settings.ZMQ_IO_THREADS)
         self.socket = context.socket(zmq.SUB)
+        self.socket.setsockopt(zmq.RCVHWM, settings.ZMQ_HWM)
+        self.socket.setsockopt(zmq.RCVBUF, settings.ZMQ_BUFFER_SIZE)
         self.socket.connect(url)
-        self.socket.setsockopt(zmq.SUBSCRIBE, b"")  # topic.encode('utf-8'))
+        self.socket.setsockopt(zmq.SUBSCRIBE, topic.encode('utf-8'))
+        # stop() wakes up the thread waiting for messages through this pair of sockets, instead of waiting for a timeout
+        self._stop_receiver = context.socket(zmq.PAIR)
+        self._stop_receiver.bind(f'inproc://subscriber-stop-{id(self)}')
+        self._stop_sender = context.socket(zmq.PAIR)
+        self._stop_sender.connect(f'inproc://subscriber-stop-{id(self)}')
         self.start()
 
     def run(self):
-        while not settings.GENERAL_STOP_EVENT.is_set():
-            event = self.socket.poll(0)
-            if not event:
-                sleep(.005)
-                continue
-            topic = self.socket.recv_string()
-            logger.debug(f"Got data on topic {topic}")
-            metadata = self.socket.recv_json(flags=0)
-            if metadata.get('numpy', False):
-                msg = self.socket.recv(flags=0, copy=True, track=False)
-                buf = memoryview(msg)
-                data = np.frombuffer(buf, dtype=metadata['dtype'])
-                data = data.reshape(metadata['shape']).copy()
-            else:
-                data = self.socket.recv_pyobj()  # flags=0, copy=True, track=False)
-            if isinstance(data, str):
-                if data == settings.SUBSCRIBER_EXIT_KEYWORD:
+        # Coroutine functions are awaited on an event loop owned by this thread
+        loop = asyncio.new_event_loop() if asyncio.iscoroutinefunction(self.func) else None
+        # Everything used for each message is looked up once, the loop only works with local names
+        socket = self.socket
+        stop_receiver = self._stop_receiver
+        general_stop, stop = settings.GENERAL_STOP_EVENT, self._stop_event
+        exit_keyword = settings.SUBSCRIBER_EXIT_KEYWORD
+        func = self.func
+        own_topic = encode_topic(self.topic)
+        reuse_buffers = self.reuse_buffers
+        copy_arrays = self.copy_arrays
+        poller = zmq.Poller()
+        poller.register(socket, zmq.POLLIN)
+        poller.register(stop_receiver, zmq.POLLIN)
+        try:
+            while not general_stop.is_set() and not stop.is_set():
+                # The timeout is only needed to notice the general stop event, which can't be polled
+                events = dict(poller.poll(100))
+                if stop_receiver in events:
+                    break
+                if socket not in events:
+                    continue
+                if reuse_buffers:
+                    # Parts are read one by one, so the array can be received straight into a preallocated buffer
+                    topic = socket.recv(copy=False)
+                    if topic.bytes != own_topic:
+                        if topic.more:
+                            socket.recv_multipart(copy=False)
+                        continue
+                    metadata = socket.recv(copy=False)
+                    payload = None
+                else:
+                    # The whole message (topic, metadata and payload) is pulled with a single call
+                    topic, metadata, *payload = socket.recv_multipart(copy=False)
+                    if topic.bytes != own_topic:
+                        # ZMQ filters topics by prefix, signals whose name starts with this topic also arrive here. They
+                        # are discarded before decoding them
+                        continue
+                logger.debug("Got data on topic %s", self.topic)
+                metadata = loads_metadata(metadata)
+                if 'shm' in metadata:
+                    data = read_shared_array(metadata, copy=copy_arrays)
+                    if data is None:
+                        continue
+                elif metadata.get('numpy', False) and payload is None:
+                    data = self._next_buffer(metadata)
+                    if socket.recv_into(data) != data.nbytes:
+                        logger.warning(f'{self} received an array with a different size than announced')
+                        continue
+                elif metadata.get('numpy', False):
+                    data = np.frombuffer(payload[0].buffer, dtype=metadata['dtype']).reshape(metadata['shape'])
+                    if copy_arrays:
+                        data = data.copy()
+                elif payload is None:
+                    data = loads_object(socket.recv_multipart(copy=False))  # The rest of the message
+                else:
+                    data = loads_object(payload)
+                if type(data) is str and data == exit_keyword:
                     logger.info(f'Stopping Subscriber {self}')
                     break
-            self.func(data)#, *self.args, **self.kwargs)
-        sleep(1)  # Gives enough time for the publishers to finish sending data before closing the socket
-        self.socket.close()
+                if loop is not None:
+                    loop.run_until_complete(func(data))
+                else:
+                    func(data)
+        finally:
+            self.socket.close(linger=0)  # A SUB socket has nothing pending to send, closing does not need to wait
+            self._stop_receiver.close(linger=0)
+            if loop is not None:
+                loop.close()
+
+    def _next_buffer(self, metadata):
+        """ Returns the preallocated array that was not used for the previous message with the same dtype and shape. """
+        key = (metadata['dtype'], tuple(metadata['shape']))
+        buffers = self._buffers.get(key)
+        if buffers is None:
+            buffers = self._buffers[key] = [np.empty(key[1], dtype=key[0]) for _ in range(2)]
+        buffers.reverse()
+        return buffers[0]
 
     def stop(self):
-        with Pusher() as pusher:
-            pusher.publish(settings.SUBSCRIBER_EXIT_KEYWORD, self.topic)
+        self._stop_event.set()
+        try:
+            self._stop_sender.send(b'', zmq.NOBLOCK)
+        except zmq.ZMQError:
+            pass  # The thread has already finished
         self.join()
+        self._stop_sender.close(linger=0)
 
     def __str__(self):
         return f"Subscriber {self.func.__name__}"
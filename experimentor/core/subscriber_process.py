@@ -11,8 +11,8 @@
         This is work in process. On Windows, since processes are spawned, the subscriber would not work as expected.
         That is why we work with Threads instead.
 """
-from multiprocessing import Process
-from time import sleep
+import logging
+from multiprocessing import Event, Process
 
 import numpy as np
 import zmq
@@ -20,7 +20,8 @@ import zmq
 from experimentor.config import settings
 from experimentor.core.meta import ExperimentorProcess
 from experimentor.core.pusher import Pusher
-from experimentor.lib.log import get_logger
+from experimentor.core.serialization import encode_topic, loads_metadata, loads_object
+from experimentor.core.shared_arrays import read_shared_array
 
 
 class Subscriber(ExperimentorProcess):
@@ -31,44 +32,68 @@ class Subscriber(ExperimentorProcess):
         self.publish_topic = publish_topic
         self.args = args
         self.kwargs = kwargs
-        self.logger = get_logger()
+        self._stop_event = Event()
         self.logger.info(f'Starting subscriber for {func.__name__} on topic {topic}')
 
     def run(self):
-        context = zmq.Context()
+        context = zmq.Context.instance(io_threads=settings.ZMQ_IO_THREADS)
         socket = context.socket(zmq.SUB)
+        socket.setsockopt(zmq.RCVHWM, settings.ZMQ_HWM)
+        socket.setsockopt(zmq.RCVBUF, settings.ZMQ_BUFFER_SIZE)
         socket.connect(f"tcp://localhost:{settings.PUBLISHER_PUBLISH_PORT}")
         if self.publish_topic:
             listener = Pusher()
-        topic_filter = self.topic.encode('utf-8')
-        socket.setsockopt(zmq.SUBSCRIBE, topic_filter)
+        own_topic = encode_topic(self.topic)
+        socket.setsockopt(zmq.SUBSCRIBE, own_topic)
         self.logger.info(f'subscriber for {self.func.__name__} on topic {self.topic} ready')
 
-        while not settings.GENERAL_STOP_EVENT.is_set():
-            topic = socket.recv_string()
-            self.logger.debug(f"Got data on topic {topic}")
-            metadata = socket.recv_json(flags=0)
-            if metadata.get('numpy', False):
-                msg = socket.recv(flags=0, copy=True, track=False)
-                buf = memoryview(msg)
-                data = np.frombuffer(buf, dtype=metadata['dtype'])
-                data = data.reshape(metadata['shape']).copy()
-            else:
-                data = socket.recv_pyobj()  # flags=0, copy=True, track=False)
-            if isinstance(data, str):
-                if data == settings.SUBSCRIBER_EXIT_KEYWORD:
-                    self.logger.info(f'Stopping Subscriber {self}')
+        # Everything used for each message is looked up once, the loop only works with local names
+        general_stop, stop = settings.GENERAL_STOP_EVENT, self._stop_event
+        exit_keyword = settings.SUBSCRIBER_EXIT_KEYWORD
+        func = self.func
+        publish_topic = self.publish_topic
+        publish = listener.publish if publish_topic else None
+        logger = self.logger
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        recv_multipart = socket.recv_multipart
+        poller = zmq.Poller()
+        poller.register(socket, zmq.POLLIN)
+        try:
+            while not general_stop.is_set() and not stop.is_set():
+                # Waiting with a timeout lets the loop notice the stop events even if nothing is published
+                if not poller.poll(100):
+                    continue
+                # Topic, metadata and payload are pulled with a single call
+                topic, metadata, *payload = recv_multipart(copy=False)
+                if topic.bytes != own_topic:
+                    # ZMQ filters topics by prefix, signals whose name starts with this topic also arrive here
+                    continue
+                if debug_enabled:
+                    logger.debug("Got data on topic %s", self.topic)
+                metadata = loads_metadata(metadata)
+                if 'shm' in metadata:
+                    data = read_shared_array(metadata)
+                    if data is None:
+                        continue
+                elif metadata.get('numpy', False):
+                    # The frame is not copied when it is received, only once when taking the array out of it
+                    data = np.frombuffer(payload[0].buffer, dtype=metadata['dtype'])
+                    data = data.reshape(metadata['shape']).copy()
+                else:
+                    data = loads_object(payload)
+                if type(data) is str and data == exit_keyword:
+                    logger.info(f'Stopping Subscriber {self}')
                     break
-            ans = self.func(data)#, *self.args, **self.kwargs)
-            if self.publish_topic:
-                listener.publish(ans, self.publish_topic)
-
-        sleep(1)  # Gives enough time for the publishers to finish sending data before closing the socket
-        socket.close()
+                ans = func(data)#, *self.args, **self.kwargs)
+                if publish is not None:
+                    publish(ans, publish_topic)
+        finally:
+            socket.close(linger=0)  # A SUB socket has nothing pending to send, closing does not need to wait
+            if publish is not None:
+                listener.finish()
 
     def stop(self):
-        with Pusher() as pusher:
-            pusher.publish(settings.SUBSCRIBER_EXIT_KEYWORD)
+        self._stop_event.set()
         self.join()
 
     def __str__(self):
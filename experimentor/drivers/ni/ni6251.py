@@ -3,7 +3,8 @@
     ---------
     Class for comunicating with the NI-6251 DAQ. It requires to have installed the DAQmx (provided by NI) and the pyDAQmx package (from pypy).
 """
-import PyDAQmx as nidaq
+import asyncio
+
 import numpy as np
 
 
@@ -12,12 +13,14 @@ class niDAQ():
     If using an expansion such as the SCC-68 it has to be properly configured through the NI-MAX software.
     """
     def __init__(self,device_number=1, model='6251',debug=0):
+        # PyDAQmx loads the NI runtime when imported, therefore it is imported only when a DAQ is actually used
+        import PyDAQmx as nidaq
+        self.adq = nidaq
         self.read = nidaq.int32()
         if debug == 1:
             print('Not implemented a debuggable version')
-        else:
-            self.adq = nidaq
         self.tasks = [] # Array to hold the tasks. Each element should be a dict
+        self.setups = {} # Analog tasks already created, by their configuration, to reuse them
         self.deviceNumber = int(device_number)
 
     def addTask(self,task):
@@ -42,33 +45,34 @@ class niDAQ():
         limits -- the limits of the expected values. A tuple of 2 values.
         Returns: numpy array of length points
         """
-        taskAnalogNumber = self.addTask({'name':'TaskAnalog','TaskHandle':nidaq.TaskHandle()})
+        taskAnalogNumber = self.addTask({'name':'TaskAnalog','TaskHandle':self.adq.TaskHandle()})
         self.task_Analog = self.getTask(taskAnalogNumber)['TaskHandle']
-        self.read = nidaq.int32()
+        self.read = self.adq.int32()
         points = int(points)
         data = np.zeros((points,), dtype=np.float64)
         channel = str.encode(channel)
         waiting_time = points*accuracy*1.05 # Adds a 5% waiting time in order to give enough time
         freq = 1/accuracy # Accuracy in seconds
-        nidaq.DAQmxCreateTask("",nidaq.byref(self.task_Analog))
-        nidaq.DAQmxCreateAIVoltageChan(self.task_Analog,channel,"",nidaq.DAQmx_Val_RSE,limits[0],limits[1],nidaq.DAQmx_Val_Volts,None)
-        nidaq.DAQmxCfgSampClkTiming(self.task_Analog,"",freq,nidaq.DAQmx_Val_Rising,nidaq.DAQmx_Val_FiniteSamps,points)
+        self.adq.DAQmxCreateTask("",self.adq.byref(self.task_Analog))
+        self.adq.DAQmxCreateAIVoltageChan(self.task_Analog,channel,"",self.adq.DAQmx_Val_RSE,limits[0],limits[1],self.adq.DAQmx_Val_Volts,None)
+        self.adq.DAQmxCfgSampClkTiming(self.task_Analog,"",freq,self.adq.DAQmx_Val_Rising,self.adq.DAQmx_Val_FiniteSamps,points)
         # DAQmx Start Code
-        nidaq.DAQmxStartTask(self.task_Analog)
-        nidaq.DAQmxReadAnalogF64(self.task_Analog,points,waiting_time,nidaq.DAQmx_Val_GroupByChannel,data,points,nidaq.byref(self.read),None)
+        self.adq.DAQmxStartTask(self.task_Analog)
+        self.adq.DAQmxReadAnalogF64(self.task_Analog,points,waiting_time,self.adq.DAQmx_Val_GroupByChannel,data,points,self.adq.byref(self.read),None)
         self.tasks[taskAnalogNumber]['alive'] = 0
         return data
 
-    def analogSetup(self,taskNum,channel,points,accuracy,limits=(-10.0,10.0)):
+    def analogSetup(self,taskNum,channel,points,accuracy,limits=(-10.0,10.0),reuse=False):
         """Prepares the task for an analog measurement.
         taskNum -- the number of the task (an integer)
         channel --  has to be defined as 1 or as [1,2], for example, meaning ai1, ai2, etc.
         points -- the total number of points to be acquired
         accuracy -- the time between acquisitions (in seconds)
         limits -- the limits of the expected values. A tuple of 2 values.
+        reuse -- creating a task in DAQmx is slow. If True and the last task set up with the same configuration was not
+        cleared, that task is stopped and its number returned instead of creating a new one. Use it only when that
+        task is no longer needed, for example when repeating a measurement.
         """
-        taskAnalogNumber = self.addTask({'name':'TaskAnalog','TaskHandle':nidaq.TaskHandle(taskNum)})
-        self.task_Analog = self.getTask(taskAnalogNumber)['TaskHandle']
         points = int(points)
         dev = 'Dev%s'%self.deviceNumber
         if type(channel) != type([]):
@@ -79,67 +83,158 @@ class niDAQ():
             channels.append(newChannel)
         channels = ', '.join(channels)
         channels = str.encode(channels)
+        setup = (channels,points,accuracy,tuple(limits))
+        if reuse and setup in self.setups:
+            taskAnalogNumber = self.setups[setup]
+            self.task_Analog = self.getTask(taskAnalogNumber)['TaskHandle']
+            self.adq.DAQmxStopTask(self.task_Analog)
+            return taskAnalogNumber
+        taskAnalogNumber = self.addTask({'name':'TaskAnalog','TaskHandle':self.adq.TaskHandle(taskNum)})
+        self.task_Analog = self.getTask(taskAnalogNumber)['TaskHandle']
         freq = 1/accuracy # Accuracy in seconds
-        nidaq.DAQmxCreateTask("",nidaq.byref(self.task_Analog))
-        nidaq.DAQmxCreateAIVoltageChan(self.task_Analog,channels,None,nidaq.DAQmx_Val_RSE,limits[0],limits[1],nidaq.DAQmx_Val_Volts,None)
+        self.adq.DAQmxCreateTask("",self.adq.byref(self.task_Analog))
+        self.adq.DAQmxCreateAIVoltageChan(self.task_Analog,channels,None,self.adq.DAQmx_Val_RSE,limits[0],limits[1],self.adq.DAQmx_Val_Volts,None)
         if points>0:
-            nidaq.DAQmxCfgSampClkTiming(self.task_Analog,"",freq,nidaq.DAQmx_Val_Rising,nidaq.DAQmx_Val_FiniteSamps,points)
+            self.adq.DAQmxCfgSampClkTiming(self.task_Analog,"",freq,self.adq.DAQmx_Val_Rising,self.adq.DAQmx_Val_FiniteSamps,points)
         else:
-            nidaq.DAQmxCfgSampClkTiming(self.task_Analog,"",freq,nidaq.DAQmx_Val_Rising,nidaq.DAQmx_Val_ContSamps,points)
+            self.adq.DAQmxCfgSampClkTiming(self.task_Analog,"",freq,self.adq.DAQmx_Val_Rising,self.adq.DAQmx_Val_ContSamps,points)
+        self.tasks[taskAnalogNumber]['channels'] = len(channel)
+        self.tasks[taskAnalogNumber]['setup'] = setup
+        self.setups[setup] = taskAnalogNumber
         return taskAnalogNumber
 
     def analogTrigger(self,taskNumber):
         """Triggers the analog measurement.
         """
         self.task_Analog = self.getTask(taskNumber)['TaskHandle']
-        if type(self.task_Analog) != type(nidaq.TaskHandle()):
+        if type(self.task_Analog) != type(self.adq.TaskHandle()):
             raise Exception('Triggering an analog measurement before defining it')
         else:
             # DAQmx Start Code
-            nidaq.DAQmxStartTask(self.task_Analog)
+            self.adq.DAQmxStartTask(self.task_Analog)
 
-    def analogRead(self,taskNumber,points,waiting=1):
+    def analogRead(self,taskNumber,points,waiting=1,reuse_buffer=False):
         """Reads a number of points from the analog task.
         Returns the total number of data points per channel acquired and a numpy array of length values*channels.
+        reuse_buffer -- if True, no array is allocated. The returned array is a view of a buffer that belongs to the
+        task and it is overwritten by the next read of the task with reuse_buffer, copy it if it has to be kept.
         """
         self.task_Analog = self.getTask(taskNumber)['TaskHandle']
-        if type(self.task_Analog) != type(nidaq.TaskHandle()):
+        if type(self.task_Analog) != type(self.adq.TaskHandle()):
             raise Exception('Reading an analog measurement before defining it')
         else:
-            self.read = nidaq.int32()
+            self.read = self.adq.int32()
             points = int(points)
+            # All the channels of the task are read at once, the buffer must fit the points of every channel
+            channels = self.getTask(taskNumber).get('channels',1)
             if points>0:
-                data = np.zeros((points,), dtype=np.float64)
-                nidaq.DAQmxReadAnalogF64(self.task_Analog,points,waiting,nidaq.DAQmx_Val_GroupByChannel,data,points,nidaq.byref(self.read),None)
+                size = points*channels
             else:
-                data = np.zeros((10000,), dtype=np.float64) # Defining a 10000 value that is completely arbitrary
-                nidaq.DAQmxReadAnalogF64(self.task_Analog,points,.2,nidaq.DAQmx_Val_GroupByChannel,data,points,nidaq.byref(self.read),None)
+                size = 10000*channels # Defining a 10000 value that is completely arbitrary
+                waiting = .2
+            if reuse_buffer:
+                data = self.getBuffer(taskNumber,size)
+            else:
+                data = np.zeros((size,), dtype=np.float64)
+            self.adq.DAQmxReadAnalogF64(self.task_Analog,points,waiting,self.adq.DAQmx_Val_GroupByChannel,data,data.size,self.adq.byref(self.read),None)
             values = self.read.value
             return values,data
 
+    def analogReadChannels(self,taskNumber,points,waiting=1,reuse_buffer=False):
+        """Reads a number of points from every channel of the analog task with a single call to the DAQ.
+        Returns the total number of data points per channel acquired and an array of shape (channels, values). With
+        reuse_buffer, the array is a view of the buffer of the task, see analogRead.
+        """
+        values,data = self.analogRead(taskNumber,points,waiting,reuse_buffer)
+        channels = self.getTask(taskNumber).get('channels',1)
+        return values,data[:channels*values].reshape(channels,values)
+
+    def analogReadRing(self,taskNumber,capacity=100000):
+        """Reads the points available in a continuous task and stores them in a ring buffer of shape
+        (channels, capacity) that belongs to the task. Monitoring a signal, therefore, does not allocate memory on every
+        read and the latest capacity points of every channel are always available.
+        Returns the ring buffer and the position where the next point will be written, which is also the position of
+        the oldest point once the buffer is full.
+        """
+        values,data = self.analogReadChannels(taskNumber,-1,reuse_buffer=True) # Copied to the ring right away
+        task = self.getTask(taskNumber)
+        ring = task.get('ring')
+        if ring is None or ring.shape != (data.shape[0],capacity):
+            ring = np.zeros((data.shape[0],capacity),dtype=np.float64)
+            task['ring'] = ring
+            task['ring_index'] = 0
+        index = task['ring_index']
+        if values >= capacity:
+            ring[:] = data[:,values-capacity:]
+            index = 0
+        else:
+            first = min(values,capacity-index)
+            ring[:,index:index+first] = data[:,:first]
+            ring[:,:values-first] = data[:,first:]
+            index = (index+values) % capacity
+        task['ring_index'] = index
+        return ring,index
+
+    def getBuffer(self,taskNumber,size):
+        """Returns a view of length size of the buffer where the task stores its readings when reusing buffers. The
+        buffer is allocated only the first time or when a larger one is needed, therefore repeated reads do not allocate
+        memory.
+        """
+        task = self.getTask(taskNumber)
+        buffer = task.get('buffer')
+        if buffer is None or buffer.size < size:
+            buffer = np.zeros((size,), dtype=np.float64)
+            task['buffer'] = buffer
+        return buffer[:size]
+
+    def waitUntilDone(self,taskNumber,timeout=-1):
+        """Blocks until the task finished acquiring, relying on DAQmx instead of polling.
+        taskNumber -- the number of the task, as returned by analogSetup
+        timeout -- maximum time to wait (in seconds). -1 means waiting indefinitely.
+        """
+        task = self.getTask(taskNumber)['TaskHandle']
+        self.adq.DAQmxWaitUntilTaskDone(task,timeout)
+
+    async def waitUntilDoneAsync(self,taskNumber,timeout=-1):
+        """Coroutine version of waitUntilDone. The blocking wait runs in the default executor of the event loop,
+        therefore several tasks (also of different DAQs) can be awaited at the same time, for example with
+        asyncio.wait(..., return_when=asyncio.FIRST_COMPLETED), and handled as soon as each of them is done.
+        taskNumber -- the number of the task, as returned by analogSetup
+        timeout -- maximum time to wait (in seconds). -1 means waiting indefinitely.
+        Returns the task number.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None,self.waitUntilDone,taskNumber,timeout)
+        return taskNumber
+
     def clear(self,tasks):
         """Clears the specified task, releasing all the resources.
         task -- list of tasks to clear
         """
         if type(tasks) != type([]):
             tasks = [tasks]
-        for task in tasks:
-            self.adq.DAQmxClearTask(self.getTask(task)['TaskHandle'])
+        for number in tasks:
+            task = self.getTask(number)
+            self.adq.DAQmxClearTask(task['TaskHandle'])
+            task['alive'] = 0
+            if self.setups.get(task.get('setup')) == int(number):
+                del self.setups[task['setup']]
+
+    def close(self):
+        """Clears all the analog tasks set up by analogSetup that were not cleared yet.
+        """
+        self.clear([i for i,task in enumerate(self.tasks) if task['alive'] and 'setup' in task])
 
 if __name__ == "__main__":
     import matplotlib.pyplot as plt
-    from time import time, sleep
     adq = niDAQ()
     points = 10000
     accuracy = 0.001
     taskNu = adq.analogSetup(0,7,points,accuracy,limits=(-1.5,1.5))
     adq.analogTrigger(taskNu)
-    t0=time()
-    while time()-t0<points*accuracy/5:
-        print('Waiting...\n')
-        sleep(1)
+    adq.waitUntilDone(taskNu,points*accuracy*1.05)
     data = adq.analogRead(taskNu,-1) # Read all the points
     points = len(data)
-    x = np.linspace(0,points*accuracy,points/10)
+    x = np.linspace(0,points*accuracy,int(points/10))
     plt.plot(x,data,'o')
     plt.show()
@@ -45,7 +45,7 @@ class TDC(Driver):
     def position(self):
         # In device units
         dev_position = self.lib.CC_GetPosition(self.serial)
-        return dev_position/self.num_position*360*Q_('deg')
+        return Q_(dev_position/self.num_position*360, 'deg')
 
     @position.setter
     def position(self, value):
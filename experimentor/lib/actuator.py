@@ -17,12 +17,14 @@
 """
 import logging
 
-from experimentor import Q_
+from experimentor.lib.general_functions import to_quantity
 
 logger = logging.getLogger(__name__)
 
 
 class Actuator:
+    __slots__ = ('name', '_properties', '_device', '_value', '_limits')
+
     def __init__(self, properties):
         """Sensor class defined by a given set of properties.
         The only mandatory field of properties is the name.
@@ -34,6 +36,11 @@ class Actuator:
         self._properties = properties
         self._device = None
         self._value = None
+        # Properties are read-only, limits are converted once instead of on every new value
+        if 'limits' in properties:
+            self._limits = (to_quantity(properties['limits']['min']), to_quantity(properties['limits']['max']))
+        else:
+            self._limits = None
 
         logger.info('Started actuator {}'.format(self.name))
 
@@ -60,8 +67,8 @@ class Actuator:
             err_str = "Trying to update a value of {} before connecting it to a device".format(self.name)
             logger.error(err_str)
             raise Exception(err_str)
-        if 'limits' in self.properties:
-            if value > Q_(self.properties['limits']['max']) or value < Q_(self.properties['limits']['min']):
+        if self._limits is not None:
+            if value > self._limits[1] or value < self._limits[0]:
                 wrn_msg = 'Trying to set {} to {}, while limits are ({}, {})'.format(self.name, value, self.properties['limits']['min'], self.properties['limits']['max'])
                 logger.warning(wrn_msg)
                 raise Warning(wrn_msg)
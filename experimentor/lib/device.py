@@ -20,6 +20,7 @@
 """
 import importlib
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from .actuator import Actuator
 from .sensor import Sensor
@@ -110,18 +111,19 @@ class Device:
             raise Exception('Driver not yet initialized')
 
         if isinstance(values, dict):
-            for k in values:
-                if not isinstance(values[k], Q_):
+            for k, raw in values.items():
+                # The driver gets the raw value, the converted one is stored in _params
+                value = raw
+                if not isinstance(value, Q_):
                     try:
                         # Tries to convert to proper units, if it fails it uses the value as is
-                        value = Q_(values[k])
+                        value = Q_(value)
                     except:
-                        logger.warning('Value {} could not be converted to Quantity'.format(values[k]))
-                        value = values[k]
+                        logger.warning('Value {} could not be converted to Quantity'.format(value))
 
-                logger.info('Setting {} to {:~}'.format(k, value))
+                logger.info('Setting {} to {}'.format(k, value))
                 try:
-                    setattr(self.driver, k, values[k])
+                    setattr(self.driver, k, raw)
                 except:
                     logger.error('Problem setting %s in %s' % (k, self))
                 self._params[k] = value
@@ -167,4 +169,28 @@ class Device:
         return self._properties
 
     def __str__(self):
-        return self._name
\ No newline at end of file
+        return self._name
+
+
+def initialize_devices(devices):
+    """ Initializes the drivers of several devices at the same time. Initializing a driver is mostly waiting for the
+    hardware to answer, therefore each device is initialized on its own thread and the total time is given by the
+    slowest device instead of the sum of all of them.
+
+    :param devices: dictionary of the form {name: Device}
+    :raises Exception: if any of the drivers could not be initialized. All the devices are given the chance to
+        initialize before raising.
+    """
+    errors = {}
+    with ThreadPoolExecutor(max_workers=max(len(devices), 1)) as executor:
+        futures = {executor.submit(dev.initialize_driver): name for name, dev in devices.items()}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                logger.error('Problem initializing {}: {}'.format(name, e))
+                errors[name] = e
+
+    if errors:
+        raise Exception('Drivers not initialized: {}'.format(', '.join(errors)))
@@ -30,7 +30,7 @@ def fitgaussian(data):
     """Returns (height, x, y, width_x, width_y)
     the gaussian parameters of a 2D distribution found by a fit"""
     params = moments(data)
-    errorfunction = lambda p: np.ravel(gaussian(*p)(*np.indices(data.shape)) -
-                                 data)
+    indices = np.indices(data.shape)  # The grid is the same for every iteration of the fit
+    errorfunction = lambda p: np.ravel(gaussian(*p)(*indices) - data)
     p, success = optimize.leastsq(errorfunction, params)
     return p
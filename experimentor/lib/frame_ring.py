@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+    Frame Ring
+    ==========
+    Ring buffer to hand frames from the thread that reads a camera to the thread that sends them (for example through
+    a ZMQ socket). Reading a camera and sending data over the network in the same loop means that any stall in the
+    network stops the acquisition, and the camera buffers overflow. With a ring in between, the camera thread only copies
+    the frame into a preallocated slot and keeps going.
+
+    There must be exactly one thread putting frames and one thread getting them. Each index is modified by only one of
+    them, therefore no locks are needed.
+
+    :copyright:  Aquiles Carattino
+    :license: MIT, see LICENSE for more details
+"""
+import numpy as np
+
+
+class FrameRing:
+    """ Single-producer, single-consumer ring of frames with the same shape and data type.
+
+    The memory for all the slots is allocated with the first frame. Slots keep the memory order of that frame, so
+    transposed frames (as the ones returned by the Basler camera) are stored with a plain copy.
+
+    Parameters
+    ----------
+    slots : int
+        Maximum number of frames waiting to be consumed
+
+    Attributes
+    ----------
+    dropped : int
+        Number of frames that were discarded because the ring was full
+    """
+    def __init__(self, slots=64):
+        self.slots = slots
+        self.dropped = 0
+        self._frames = None
+        self._head = 0  # Number of frames put, only modified by the producer
+        self._tail = 0  # Number of frames released, only modified by the consumer
+
+    def put(self, frame):
+        """ Copies a frame to the next free slot. It never blocks, if the consumer is lagging and the ring is full, the
+        frame is dropped.
+
+        Parameters
+        ----------
+        frame : numpy.ndarray
+
+        Returns
+        -------
+        bool
+            Whether the frame was stored
+        """
+        slot = self.claim(frame.shape, frame.dtype, fortran=frame.flags.f_contiguous and not frame.flags.c_contiguous)
+        if slot is None:
+            return False
+        slot[...] = frame
+        self.commit()
+        return True
+
+    def claim(self, shape, dtype, fortran=False):
+        """ Returns the next free slot, so the producer can write a frame directly into it (for example with
+        :meth:`~experimentor.models.devices.cameras.basler.basler.BaslerCamera.read_camera_into`), avoiding an
+        intermediate copy. The frame becomes available to the consumer only after calling :meth:`commit`.
+
+        Parameters
+        ----------
+        shape : tuple
+            Shape of the frames, used to allocate the ring the first time
+        dtype : numpy.dtype
+            Data type of the frames, used to allocate the ring the first time
+        fortran : bool
+            Whether to store the frames in Fortran order
+
+        Returns
+        -------
+        numpy.ndarray or None
+            The free slot or None if the ring is full, in which case the frame is counted as dropped
+        """
+        if self._frames is None:
+            self._frames = self._allocate(shape, dtype, fortran)
+        if self._head - self._tail >= self.slots:
+            self.dropped += 1
+            return None
+        return self._frames[self._head % self.slots]
+
+    def commit(self):
+        """ Makes the slot returned by :meth:`claim` available to the consumer. """
+        self._head += 1
+
+    def get(self):
+        """ Returns the oldest frame that was not released, or None if there are no frames available. The frame is a
+        view of the slot, therefore it remains valid (and it can be sent with ``copy=False``) until :meth:`release` is
+        called.
+        """
+        if self._tail == self._head:
+            return None
+        return self._frames[self._tail % self.slots]
+
+    def get_batch(self, max_frames):
+        """ Returns up to max_frames of the oldest frames that were not released, as a single array of shape
+        (frames, ) + frame shape, or None if there are no frames available. Only consecutive slots are returned, when the
+        ring wraps around the rest of the frames come in the next batch. Sending several small frames at once saves
+        a system call per frame.
+
+        As with :meth:`get`, the frames are views of the slots and remain valid until they are released, in this case
+        with ``release(len(batch))``.
+        """
+        available = self._head - self._tail
+        if available == 0:
+            return None
+        start = self._tail % self.slots
+        return self._frames[start:start + min(available, self.slots - start, max_frames)]
+
+    def release(self, frames=1):
+        """ Frees the slots of the frames returned by :meth:`get` or :meth:`get_batch`, making them available to the
+        producer.
+        """
+        self._tail += frames
+
+    def __len__(self):
+        return self._head - self._tail
+
+    def _allocate(self, shape, dtype, fortran):
+        shape = tuple(shape)
+        if fortran:
+            # Allocate with the axes reversed, and transpose each slot back, to keep the frames in Fortran order
+            frames = np.empty((self.slots, ) + shape[::-1], dtype=dtype)
+            return frames.transpose((0, ) + tuple(range(len(shape), 0, -1)))
+        return np.empty((self.slots, ) + shape, dtype=dtype)
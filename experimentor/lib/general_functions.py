@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+    General Functions
+    =================
+    Helper functions that do not belong to any model in particular, but that are used across the program. For example,
+    loading configuration files from the hard drive.
+
+    :copyright:  Aquiles Carattino
+    :license: MIT, see LICENSE for more details
+"""
+import json
+import os
+import tempfile
+from functools import lru_cache
+
+import yaml
+
+from experimentor import Q_
+from experimentor.lib.log import get_logger
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+logger = get_logger(__name__)
+
+_loaded_yaml = {}  # Absolute path: (modification time, contents serialized as JSON)
+
+
+def from_yaml_to_dict(filename):
+    """ Reads a YAML file and returns its contents. Parsing YAML is slow, therefore the parsed contents are stored next
+    to the original file as a JSON sidecar (``filename + '.json'``). The sidecar is used only while it is newer than the
+    YAML file, so editing the configuration invalidates it automatically. If PyYAML was built with libyaml, the C
+    loader is used to parse the file.
+
+    The JSON of files that are not modified is also kept in memory, therefore loading the same file several times (for
+    example from different experiments) doesn't touch the disk again. Every call decodes its own copy of the contents.
+
+    Contents that do not survive a JSON round trip (for example, non-string keys or dates) are never cached, and a
+    sidecar that can't be written (for example, in a read-only folder) is silently skipped.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the YAML file
+
+    Returns
+    -------
+    dict
+        The parsed contents of the file
+    """
+    path = os.path.abspath(filename)
+    mtime = os.path.getmtime(path)
+    if path in _loaded_yaml and _loaded_yaml[path][0] == mtime:
+        return json.loads(_loaded_yaml[path][1])
+
+    data, serialized = _read_yaml(path, mtime)
+    if serialized is not None:
+        _loaded_yaml[path] = (mtime, serialized)
+    else:
+        _loaded_yaml.pop(path, None)
+    return data
+
+
+def _read_yaml(filename, mtime):
+    """ Reads the YAML file, or its JSON sidecar if it is up to date, and refreshes the sidecar if needed. Returns the
+    contents and their JSON, which is None if they can't be cached. """
+    cache = filename + '.json'
+    try:
+        if os.path.getmtime(cache) >= mtime:
+            with open(cache, 'r') as f:
+                serialized = f.read()
+            return json.loads(serialized), serialized
+    except (OSError, ValueError):
+        pass
+
+    with open(filename, 'r') as f:
+        data = yaml.load(f, Loader=SafeLoader)
+
+    serialized = _to_json(data)
+    if serialized is not None:
+        _write_json_cache(cache, serialized)
+    return data, serialized
+
+
+def _to_json(data):
+    """ Serializes data as JSON, only if reading it back would give the same data. Returns None otherwise. """
+    try:
+        serialized = json.dumps(data)
+    except (TypeError, ValueError):
+        return None
+    if json.loads(serialized) != data:
+        return None
+    return serialized
+
+
+def _write_json_cache(cache, serialized):
+    """ Atomically stores the JSON in the cache file. """
+    try:
+        fd, tmp_name = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(cache)), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(serialized)
+            os.replace(tmp_name, cache)
+        except OSError:
+            os.remove(tmp_name)
+            raise
+    except OSError as e:
+        logger.debug(f'Not caching {cache}: {e}')
+
+
+@lru_cache(maxsize=256)
+def to_quantity(value):
+    """ Converts a string such as ``'10nm'`` to a Quantity. Parsing units with Pint is slow, and the same strings (for
+    example limits or ranges coming from a configuration file) are parsed over and over, therefore the results are
+    cached. The returned Quantity is shared between callers and should not be modified in place.
+
+    Parameters
+    ----------
+    value : str
+        The string to convert
+
+    Returns
+    -------
+    Quantity
+    """
+    return Q_(value)
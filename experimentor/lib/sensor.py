@@ -14,6 +14,8 @@ logger = logging.getLogger(__name__)
 
 
 class Sensor:
+    __slots__ = ('name', 'device', '_value', '_properties')
+
     def __init__(self, properties):
         """Sensor class defined by a given set of properties.
         The only mandatory field is the name.
@@ -23,6 +25,7 @@ class Sensor:
             raise Exception('All sensors need a name')
 
         self.name = properties['name']
+        self.device = None
         self._value = None
         self._properties = properties
 
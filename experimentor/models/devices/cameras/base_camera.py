@@ -28,7 +28,7 @@
 """
 import numpy as np
 
-from experimentor import Q_
+from experimentor.lib.general_functions import to_quantity
 from experimentor.lib.log import get_logger
 from experimentor.models.decorators import not_implemented
 from experimentor.models.devices.base_device import ModelDevice
@@ -135,7 +135,7 @@ class BaseCamera(ModelDevice):
                 exposure = properties['exposure_time']
                 self.logger.info(f'Updating exposure to {exposure}')
                 if isinstance(exposure, str):
-                    exposure = Q_(exposure)
+                    exposure = to_quantity(exposure)
 
                 new_exp = self.set_exposure(exposure)
                 self.config['exposure_time'] = new_exp
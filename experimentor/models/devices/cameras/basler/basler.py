@@ -10,6 +10,7 @@ from pypylon import pylon, _genicam
 
 from experimentor import Q_
 from experimentor.core.signal import Signal
+from experimentor.lib.general_functions import to_quantity
 from experimentor.lib.log import get_logger
 from experimentor.models.action import Action
 from experimentor.models.decorators import make_async_thread
@@ -33,9 +34,12 @@ class BaslerCamera(BaseCamera):
         self.fps = 0
         self.keep_reading = False
         self.continuous_reads_running = False
+        self._continuous_reads_stopped = Event()
+        self._continuous_reads_stopped.set()
         self.finalized = False
         self._buffer_size = None
         self.current_dtype = None
+        self._grab_timeout = None
 
     @Feature()
     def buffer_size(self):
@@ -43,7 +47,7 @@ class BaslerCamera(BaseCamera):
 
     @buffer_size.setter
     def buffer_size(self, value):
-        value = Q_(value)
+        value = to_quantity(value) if isinstance(value, str) else Q_(value)
         self.logger.info(f'{self} - Setting buffer size to {value}')
         self._buffer_size = value
 
@@ -90,7 +94,7 @@ class BaslerCamera(BaseCamera):
         if self.config['exposure'] is not None:
             return self.config['exposure']
         try:
-            exposure = float(self._driver.ExposureTime.ToString()) * Q_('us')
+            exposure = Q_(float(self._driver.ExposureTime.ToString()), 'us')
             return exposure
         except _genicam.TimeoutException:
             self.logger.error('Timeout getting the exposure')
@@ -99,11 +103,14 @@ class BaslerCamera(BaseCamera):
     @exposure.setter
     def exposure(self, exposure: Q_):
         self.logger.info(f'Setting exposure to {exposure}')
+        self._grab_timeout = None
         try:
-            if not isinstance(exposure, Q_):
+            if isinstance(exposure, str):
+                exposure = to_quantity(exposure)
+            elif not isinstance(exposure, Q_):
                 exposure = Q_(exposure)
             self._driver.ExposureTime.SetValue(exposure.m_as('us'))
-            exposure = float(self._driver.ExposureTime.ToString()) * Q_('us')
+            exposure = Q_(float(self._driver.ExposureTime.ToString()), 'us')
             self.config.upgrade({'exposure': exposure})
         except _genicam.TimeoutException:
             self.logger.error(f'Timed out setting the exposure to {exposure}')
@@ -322,14 +329,22 @@ class BaslerCamera(BaseCamera):
         self.logger.info('Executed Software Trigger')
         self.config.fetch_all()
 
+    @property
+    def grab_timeout(self) -> int:
+        """ Timeout for retrieving a frame, in milliseconds. It is derived from the exposure only after the exposure
+        changes, reading frames does not need to go through the exposure feature and its units. """
+        if self._grab_timeout is None:
+            self._grab_timeout = int(self.exposure.m_as('ms')) + 100
+        return self._grab_timeout
+
     # @Action
     def read_camera(self) -> list:
         with self._basler_lock:
             img = []
             mode = self.acquisition_mode
-            self.logger.debug(f'Grabbing mode: {mode}')
+            self.logger.debug('Grabbing mode: %s', mode)
             if mode == self.MODE_SINGLE_SHOT or mode == self.MODE_LAST:
-                grab = self._driver.RetrieveResult(int(self.exposure.m_as('ms')) + 100, pylon.TimeoutHandling_Return)
+                grab = self._driver.RetrieveResult(self.grab_timeout, pylon.TimeoutHandling_Return)
                 if grab and grab.GrabSucceeded():
                     img = [grab.GetArray().T]
                     self.temp_image = img[0]
@@ -346,8 +361,11 @@ class BaslerCamera(BaseCamera):
                         self.logger.warning(f'{self} Buffer filled to 90% num buffers: {num_buffers}')
                     img = [np.zeros((self.width, self.height), dtype=self.current_dtype)] * num_buffers
                     tot_frames = 0
+                    # Features query the camera on every access, they are resolved once for all the buffers
+                    retrieve_result = self._driver.RetrieveResult
+                    timeout = self.grab_timeout
                     for i in range(num_buffers):
-                        grab = self._driver.RetrieveResult(int(self.exposure.m_as('ms')) + 100, pylon.TimeoutHandling_ThrowException)
+                        grab = retrieve_result(timeout, pylon.TimeoutHandling_ThrowException)
                         if grab:
                             if grab.GrabSucceeded():
                                 img[i] = grab.GetArray().T
@@ -370,22 +388,58 @@ class BaslerCamera(BaseCamera):
 
             return img
 
+    def read_camera_into(self, out: np.ndarray) -> int:
+        """ Reads a single frame and writes it into ``out``, instead of allocating a new array for it. The frame is
+        copied once, straight from the buffer of the camera, therefore a preallocated array (or a slot of a
+        :class:`~experimentor.lib.frame_ring.FrameRing`) can be reused for every frame.
+
+        Parameters
+        ----------
+        out : numpy.ndarray
+            Array of shape (width, height) and the data type of the current pixel format
+
+        Returns
+        -------
+        int
+            The number of bytes written, 0 if no frame was available
+        """
+        with self._basler_lock:
+            mode = self.acquisition_mode
+            if mode == self.MODE_CONTINUOUS and not self._driver.IsGrabbing():
+                raise WrongCameraState('You need to trigger the camera before reading')
+            grab = self._driver.RetrieveResult(self.grab_timeout, pylon.TimeoutHandling_Return)
+            written = 0
+            if grab:
+                if grab.GrabSucceeded():
+                    with grab.GetArrayZeroCopy() as frame:
+                        np.copyto(out, frame.T)
+                    written = out.nbytes
+                else:
+                    self.logger.warning(f'{self}: Grabbing failed {grab.ErrorDescription}')
+                grab.Release()
+            if mode == self.MODE_SINGLE_SHOT:
+                self._driver.StopGrabbing()
+            return written
+
     @make_async_thread
     def continuous_reads(self):
+        self._continuous_reads_stopped.clear()
         self.continuous_reads_running = True
         self.keep_reading = True
-        while self.keep_reading:
-            imgs = self.read_camera()
-            if len(imgs) >= 1:
-                for img in imgs:
-                    self.new_image.emit(img)
-            time.sleep(.001)
-        self.continuous_reads_running = False
+        try:
+            while self.keep_reading:
+                imgs = self.read_camera()
+                if len(imgs) >= 1:
+                    for img in imgs:
+                        self.new_image.emit(img)
+                time.sleep(.001)
+        finally:
+            self.continuous_reads_running = False
+            self._continuous_reads_stopped.set()
 
     def stop_continuous_reads(self):
         self.keep_reading = False
-        while self.continuous_reads_running:
-            time.sleep(.1)
+        self._continuous_reads_stopped.wait()
         self.logger.info(f'{self} - Stopped continuous reads')
 
     def start_free_run(self):
@@ -424,8 +478,7 @@ class BaslerCamera(BaseCamera):
         self.stop_free_run()
 
         self.stop_camera()
-        while self.continuous_reads_running:
-            time.sleep(.1)
+        self._continuous_reads_stopped.wait()
 
         super(BaslerCamera, self).finalize()
         self.finalized = True
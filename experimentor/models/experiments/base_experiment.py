@@ -8,14 +8,16 @@
     assess their limitations. The general pattern is that of the PUB/SUB, with one publisher and several subscribers.
 
     The messages should include a *topic* and data. For this, the elements in the queue should be dictionaries with two
-    keywords: **data** and **topic**. ``data['data']`` will be serialized through the use of cPickle, and is handled
-    automatically by pyZQM through the use of ``send_pyobj``. The subscribers should be aware of this and use either
-    unpickle or ``recv_pyobj``.
+    keywords: **data** and **topic**. Numpy arrays are sent as they are, next to their metadata. Any other
+    ``data['data']`` is pickled with protocol 5 and sent as a multipart message, with its large buffers as frames of
+    their own (see :func:`~experimentor.core.serialization.dumps_object`). ``recv_pyobj`` can't decode these messages,
+    subscribers should use :func:`~experimentor.core.serialization.loads_object` on the received parts, or
+    :class:`~experimentor.core.subscriber.Subscriber`, which already does it.
 
     In order to stop the publisher process, the string ``'stop'`` should be placed in ``data['data']``. The message
     will be broadcast and can be used to stop other processes, such as subscribers.
 
-    .. TODO:: Check whether the serialization of objects with cPickle may be a bottleneck for performance.
+    .. TODO:: Check whether the serialization of objects with pickle may be a bottleneck for performance.
 
     :license: MIT, see LICENSE for more details
     :copyright: 2020 Aquiles Carattino
@@ -32,6 +34,7 @@ import yaml
 from experimentor.core.meta import ExperimentorProcess
 from experimentor.core.signal import Signal
 from experimentor.core.subscriber import Subscriber
+from experimentor.lib.general_functions import from_yaml_to_dict
 from experimentor.lib.log import get_logger
 from experimentor.models.decorators import not_implemented
 from experimentor.models.models import BaseModel
@@ -95,13 +98,7 @@ class MetaExperiment(MetaModel):
     def _get_instances(cls, recursive=False):
         """Get all instances of this class in the registry. If recursive=True
         search subclasses recursively"""
-        instances = list(cls._instances)
-        if recursive:
-            for Child in cls.__subclasses__():
-                instances += Child._get_instances(recursive=recursive)
-
-        # Remove duplicates from multiple inheritance.
-        return list(set(instances))
+        return cls.get_instances(recursive=recursive)
 
 
 class BaseExperiment(BaseModel, metaclass=MetaExperiment):
@@ -144,6 +141,17 @@ class Experiment(BaseExperiment):
         atexit.register(self.finalize)
         self.is_alive = True
 
+    @classmethod
+    def from_dict(cls, config):
+        """ Creates the experiment from a configuration that is already available as a dictionary, for example when
+        running the same experiment with configurations generated by a script, skipping YAML altogether.
+
+        :param dict config: the configuration of the experiment, as it would be loaded from the YAML file.
+        """
+        experiment = cls()
+        experiment.config = config
+        return experiment
+
     def stop_subscribers(self):
         """ Puts the proper data into every alive subscriber in order to stop it.
         """
@@ -181,18 +189,23 @@ class Experiment(BaseExperiment):
         })
         self._connections[-1]['process'].start()
 
-    def load_configuration(self, filename, loader=yaml.SafeLoader):
+    def load_configuration(self, filename, loader=None):
         """ Loads the configuration file in YAML format.
 
         :param str filename: full path to where the configuration file is located.
+        :param loader: YAML loader to use. If not specified, the file is safe-loaded through
+            :func:`~experimentor.lib.general_functions.from_yaml_to_dict`, which caches the parsed contents.
         :raises FileNotFoundError: if the file does not exist.
         """
         self.logger.info('Loading configuration file {}'.format(filename))
         try:
-            with open(filename, 'r') as f:
-                self.config = yaml.load(f, Loader=loader)
-                self.logger.debug('Config loaded')
-                self.logger.debug(self.config)
+            if loader is None:
+                self.config = from_yaml_to_dict(filename)
+            else:
+                with open(filename, 'r') as f:
+                    self.config = yaml.load(f, Loader=loader)
+            self.logger.debug('Config loaded')
+            self.logger.debug(self.config)
         except FileNotFoundError:
             self.logger.error('The specified file {} could not be found'.format(filename))
             raise
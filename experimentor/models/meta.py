@@ -27,8 +27,10 @@ class MetaModel(type):
         # Create class
         super(MetaModel, cls).__init__(name, bases, attrs)
 
-        # Initialize fresh instance storage
+        # Initialize fresh instance storage. _all_instances also holds the instances of every subclass, so recursive
+        # lookups don't need to walk the tree of subclasses
         cls._instances = weakref.WeakSet()
+        cls._all_instances = weakref.WeakSet()
         cls._models = weakref.WeakSet()
         cls._models.add(cls)
 
@@ -39,6 +41,9 @@ class MetaModel(type):
         # Store weak reference to instance. WeakSet will automatically remove
         # references to objects that have been garbage collected
         cls._instances.add(inst)
+        for base in cls.__mro__:
+            if isinstance(base, MetaModel):
+                base._all_instances.add(inst)
 
         return inst
 
@@ -50,13 +55,9 @@ class MetaModel(type):
         recursive: bool
             Search for instances recursively through inherited objects
         """
-        instances = list(cls._instances)
         if recursive:
-            for Child in cls.__subclasses__():
-                instances += Child.get_instances(recursive=recursive)
-
-        # Remove duplicates from multiple inheritance.
-        return list(set(instances))
+            return list(cls._all_instances)
+        return list(cls._instances)
 
     def get_models(cls, recursive=False):
         """Gets all the models which share the MetaModel origin.
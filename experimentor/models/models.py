@@ -10,12 +10,13 @@ Models can also take care of manipulating data, for example calculating an FFT a
 """
 import atexit
 import multiprocessing as mp
-import time
 from abc import abstractmethod
 import numpy as np
 
 import zmq
 
+from experimentor.config import settings
+from experimentor.core.serialization import dumps_array_metadata, dumps_metadata, dumps_object, encode_topic
 from experimentor.lib.log import get_logger
 from experimentor.models.meta import MetaModel
 
@@ -56,15 +57,17 @@ class BaseModel(metaclass=MetaModel):
     def __init__(self):
         atexit.register(self.finalize)
         self._threads = []
+        self._subscribers = ExpDict()
         self._ctx = self.create_context()
         self._publisher = self.create_publisher()
         self.logger = get_logger()
 
     def create_context(self):
-        """ Creates the ZMQ context. In case of wanting to use a specific context (perhaps globally defined), overwrite
-        this method in the child classes. This method is called during the model instantiation.
+        """ Returns the ZMQ context, by default the one shared by the whole process. In case of wanting to use a
+        specific context, overwrite this method in the child classes. This method is called during the model
+        instantiation.
         """
-        return zmq.Context()
+        return zmq.Context.instance(io_threads=settings.ZMQ_IO_THREADS)
 
     def get_context(self):
         """ Gets the context. By default it is stored as a 'private' attribute of the model. Overwrite this method in
@@ -78,8 +81,9 @@ class BaseModel(metaclass=MetaModel):
         return self._ctx
 
     def create_publisher(self):
-        """ Creates a ZMQ publisher. It will be used by signals to broadcast their information. There is a delay before
-        returning the publisher to guarantee that it was properly initialized before actually using it.
+        """ Creates a ZMQ publisher. It will be used by signals to broadcast their information. Binding is
+        synchronous, the publisher can be used as soon as it is returned. Subscribers that connect later miss the
+        messages sent before they joined, as with any PUB socket.
 
         Returns
         -------
@@ -90,8 +94,11 @@ class BaseModel(metaclass=MetaModel):
         """
         ctx = self.get_context()
         publisher = ctx.socket(zmq.PUB)
+        publisher.setsockopt(zmq.SNDHWM, settings.ZMQ_HWM)
+        publisher.setsockopt(zmq.SNDBUF, settings.ZMQ_BUFFER_SIZE)
         publisher.bind('tcp://*:*')
-        time.sleep(2)
+        if settings.SIGNALS_INPROC:
+            publisher.bind(self.get_publisher_inproc_url())
         return publisher
 
     def get_publisher(self):
@@ -108,6 +115,17 @@ class BaseModel(metaclass=MetaModel):
         """
         return 'tcp://localhost'
 
+    def get_publisher_inproc_url(self):
+        """ Subscribers running in the same process as the model connect to the publisher through this address, which
+        skips the TCP stack. It can only be used with the context returned by :func:`self.get_context`.
+
+        Returns
+        -------
+        str :
+            The inproc address to which the publisher is bound
+        """
+        return f'inproc://experimentor-model-{id(self)}'
+
     def get_publisher_port(self):
         """ ZMQ allows to create publishers that bind to an available port without specifying which one. This
         flexibility means that we should check to which port the publisher was bound if we want to use it. See
@@ -139,8 +157,8 @@ class BaseModel(metaclass=MetaModel):
             performance in case there are many subscribers.
         payload
             It will be sent by the publisher. In case it is a ``numpy`` array, it will use a zero-copy strategy. For the
-            rest, it will send using ``send_pyobj``, which serializes the payload using pickle. This can be a *slow*
-            process for complex objects.
+            rest, it will send the payload pickled (see :func:`~experimentor.core.serialization.dumps_object`), which
+            can be a *slow* process for complex objects.
         kwargs
             Optional keyword arguments to make the method future-proof. Rigth now, the only supported keyword argument
             is ``meta``, which will append to the current meta_data being broadcast. For numpy arrays, metadata is a
@@ -149,7 +167,7 @@ class BaseModel(metaclass=MetaModel):
             overwrite its keys unless you know what you are doing.
         """
         publisher = self.get_publisher()
-        publisher.send_string(signal_name, zmq.SNDMORE)
+        publisher.send(encode_topic(signal_name), zmq.SNDMORE)
         if 'meta' in kwargs:
             extra_meta = kwargs.get('meta')
         else:
@@ -157,20 +175,25 @@ class BaseModel(metaclass=MetaModel):
 
         meta_data = dict(numpy=False)
         if isinstance(payload, np.ndarray):
+            # The metadata only describes C-ordered arrays, others (e.g. transposed frames) are copied in that order
+            payload = np.ascontiguousarray(payload)
+        if isinstance(payload, np.ndarray) and extra_meta is None:
+            publisher.send(dumps_array_metadata(payload), zmq.SNDMORE)
+            publisher.send(payload, 0, copy=True, track=False)
+        elif isinstance(payload, np.ndarray):
             meta_data = dict(
                 numpy=True,
                 dtype=str(payload.dtype),
                 shape=payload.shape,
             )
-            if extra_meta is not None:
-                meta_data.update(extra_meta)
-            publisher.send_json(meta_data, 0 | zmq.SNDMORE)
+            meta_data.update(extra_meta)
+            publisher.send(dumps_metadata(meta_data), zmq.SNDMORE)
             publisher.send(payload, 0, copy=True, track=False)
         else:
             if extra_meta is not None:
                 meta_data.update(extra_meta)
-            publisher.send_json(meta_data, 0 | zmq.SNDMORE)
-            publisher.send_pyobj(payload)
+            publisher.send(dumps_metadata(meta_data), zmq.SNDMORE)
+            publisher.send_multipart(dumps_object(payload))
 
     @classmethod
     def get_actions(cls):
@@ -201,7 +224,7 @@ class BaseModel(metaclass=MetaModel):
 
     @property
     def subscribers(self):
-        return [sub for sub in self._subscribers if sub.is_alive()]
+        return [sub for sub in self._subscribers.values() if sub.is_alive()]
 
     @classmethod
     def as_process(cls, *args, **kwargs):
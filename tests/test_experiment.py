@@ -13,6 +13,15 @@ class TestExperimentModel(unittest.TestCase):
         exp.stop_subscribers()
         exp.finalize()
 
+    def test_from_dict(self):
+        class Exp(Experiment):
+            pass
+        config = {'camera': {'exposure': '10ms'}}
+        exp = Exp.from_dict(config)
+        self.assertIsInstance(exp, Exp)
+        self.assertEqual(exp.config, config)
+        exp.finalize()
+
     def test_make_folder(self):
         folder, filename = Experiment.make_filename('.', '{i}.dat')
         folder = os.path.abspath(folder)
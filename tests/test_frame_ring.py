@@ -0,0 +1,78 @@
+import unittest
+from threading import Thread
+
+import numpy as np
+
+from experimentor.lib.frame_ring import FrameRing
+
+
+class TestFrameRing(unittest.TestCase):
+    def test_put_get_release(self):
+        ring = FrameRing(slots=2)
+        self.assertIsNone(ring.get())
+        frame = np.arange(12, dtype=np.uint16).reshape(3, 4)
+        self.assertTrue(ring.put(frame))
+        np.testing.assert_array_equal(ring.get(), frame)
+        ring.release()
+        self.assertEqual(len(ring), 0)
+
+    def test_full_ring_drops_frames(self):
+        ring = FrameRing(slots=2)
+        frame = np.zeros((3, 4))
+        self.assertTrue(ring.put(frame))
+        self.assertTrue(ring.put(frame))
+        self.assertFalse(ring.put(frame))
+        self.assertEqual(ring.dropped, 1)
+
+    def test_keeps_fortran_order(self):
+        ring = FrameRing(slots=2)
+        frame = np.arange(12, dtype=np.uint16).reshape(3, 4).T
+        ring.put(frame)
+        stored = ring.get()
+        self.assertTrue(stored.flags.f_contiguous)
+        np.testing.assert_array_equal(stored, frame)
+
+    def test_get_batch(self):
+        ring = FrameRing(slots=4)
+        for i in range(3):
+            ring.put(np.full((2, 2), i))
+        ring.get_batch(2)
+        ring.release(2)
+        for i in range(3, 6):
+            ring.put(np.full((2, 2), i))
+        batch = ring.get_batch(10)  # Stops where the ring wraps around
+        self.assertEqual(batch[:, 0, 0].tolist(), [2, 3])
+        ring.release(len(batch))
+        self.assertEqual(ring.get_batch(10)[:, 0, 0].tolist(), [4, 5])
+
+    def test_claim_commit(self):
+        ring = FrameRing(slots=1)
+        slot = ring.claim((3, 4), np.uint8, fortran=True)
+        self.assertTrue(slot.flags.f_contiguous)
+        slot[...] = 7
+        self.assertIsNone(ring.get())
+        ring.commit()
+        self.assertTrue(np.all(ring.get() == 7))
+        self.assertIsNone(ring.claim((3, 4), np.uint8))
+        self.assertEqual(ring.dropped, 1)
+
+    def test_threads(self):
+        ring = FrameRing(slots=4)
+        received = []
+
+        def consume():
+            while len(received) < 100:
+                frame = ring.get()
+                if frame is None:
+                    continue
+                received.append(int(frame[0, 0]))
+                ring.release()
+
+        consumer = Thread(target=consume)
+        consumer.start()
+        i = 0
+        while i < 100:
+            if ring.put(np.full((2, 2), i)):
+                i += 1
+        consumer.join()
+        self.assertEqual(received, list(range(100)))
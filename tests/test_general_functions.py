@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+
+from experimentor import Q_
+from experimentor.lib.general_functions import from_yaml_to_dict, to_quantity
+
+
+class TestYAMLLoading(unittest.TestCase):
+    def setUp(self) -> None:
+        self.folder = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.folder.name, 'config.yml')
+        with open(self.filename, 'w') as f:
+            f.write('camera:\n  exposure: 10ms\n  roi: [1, 2, 3, 4]\n')
+
+    def tearDown(self) -> None:
+        self.folder.cleanup()
+
+    def test_load_creates_cache(self):
+        data = from_yaml_to_dict(self.filename)
+        self.assertEqual(data['camera']['exposure'], '10ms')
+        self.assertTrue(os.path.isfile(self.filename + '.json'))
+        self.assertEqual(from_yaml_to_dict(self.filename), data)
+
+    def test_stale_cache_is_ignored(self):
+        from_yaml_to_dict(self.filename)
+        with open(self.filename, 'w') as f:
+            f.write('camera:\n  exposure: 20ms\n')
+        cache_time = os.path.getmtime(self.filename + '.json')
+        os.utime(self.filename, (cache_time + 10, cache_time + 10))
+        self.assertEqual(from_yaml_to_dict(self.filename)['camera']['exposure'], '20ms')
+
+    def test_loaded_contents_are_independent(self):
+        data = from_yaml_to_dict(self.filename)
+        data['camera']['exposure'] = '1s'
+        self.assertEqual(from_yaml_to_dict(self.filename)['camera']['exposure'], '10ms')
+
+    def test_non_json_data_not_cached(self):
+        with open(self.filename, 'w') as f:
+            f.write('1: one\n2: two\n')
+        data = from_yaml_to_dict(self.filename)
+        self.assertEqual(data[1], 'one')
+        self.assertFalse(os.path.isfile(self.filename + '.json'))
+
+
+class TestToQuantity(unittest.TestCase):
+    def test_parse_is_cached(self):
+        value = to_quantity('10nm')
+        self.assertEqual(value, Q_('10nm'))
+        self.assertIs(to_quantity('10nm'), value)
@@ -0,0 +1,42 @@
+import unittest
+from threading import Barrier
+
+from experimentor import Q_
+from experimentor.lib.device import Device, initialize_devices
+
+
+class TestInitializeDevices(unittest.TestCase):
+    def test_devices_initialize_in_parallel(self):
+        barrier = Barrier(3, timeout=5)
+
+        class SlowDevice(Device):
+            def initialize_driver(self):
+                barrier.wait()  # Only passes if the three devices are initializing at the same time
+                self.driver = True
+
+        devices = {name: SlowDevice({'name': name}) for name in ('daq', 'laser', 'camera')}
+        initialize_devices(devices)
+        self.assertTrue(all(dev.driver for dev in devices.values()))
+
+    def test_errors_are_raised(self):
+        class BrokenDevice(Device):
+            def initialize_driver(self):
+                raise Exception('Driver not initialized')
+
+        devices = {'daq': Device({'name': 'daq'}), 'laser': BrokenDevice({'name': 'laser'})}
+        with self.assertRaises(Exception) as cm:
+            initialize_devices(devices)
+        self.assertIn('laser', str(cm.exception))
+
+
+class TestApplyValues(unittest.TestCase):
+    def test_apply_values(self):
+        class Driver:
+            pass
+
+        device = Device({'name': 'laser'})
+        device.add_driver(Driver())
+        device.apply_values({'wavelength': Q_('1500nm'), 'mode': 'sweep'})
+        self.assertEqual(device.driver.wavelength, Q_('1500nm'))
+        self.assertEqual(device.params['wavelength'], Q_('1500nm'))
+        self.assertEqual(device.driver.mode, 'sweep')
@@ -1,6 +1,10 @@
 import unittest
+from threading import Event
 from time import sleep
 
+import zmq
+
+from experimentor.config import settings
 from experimentor.core.exceptions import ModelDefinitionException
 from experimentor.core.signal import Signal
 from experimentor.models.decorators import make_async_thread
@@ -60,3 +64,54 @@ class TestModelCreation(unittest.TestCase):
         self.assertEqual(len(tm._threads), 1)
         tm.clean_up_threads()
         self.assertEqual(len(tm._threads), 0)
+
+    def assert_signal_delivered(self, tm, connections=1):
+        """ Connects tm.receive to tm.signal the given number of times, emits the signal and checks that receive got it
+        once. """
+        for _ in range(connections):
+            tm.signal.connect(tm.receive)
+        self.assertEqual(len(tm.subscribers), 1)
+        sleep(.5)  # Gives time to the subscriber to connect, PUB sockets drop messages sent before that
+        tm.signal.emit('payload')
+        received = tm.received.wait(5)
+        for subscriber in tm.subscribers:
+            subscriber.stop()
+        tm.finalize()
+        self.assertTrue(received)
+        self.assertEqual(tm.calls, ['payload'])
+
+    def test_signal_connect_once(self):
+        self.assert_signal_delivered(SignalModel(), connections=2)
+
+    def test_signal_connect_coroutine(self):
+        self.assert_signal_delivered(CoroutineSignalModel())
+
+    def test_signal_connect_inproc(self):
+        self.assertTrue(settings.SIGNALS_INPROC)
+        tm = InprocSignalModel()
+        subscriber = tm.signal.connect(tm.receive)
+        self.assertEqual(subscriber.socket.getsockopt(zmq.LAST_ENDPOINT).decode(), tm.get_publisher_inproc_url())
+        self.assert_signal_delivered(tm)
+
+
+class SignalModel(BaseModel):
+    signal = Signal()
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+        self.received = Event()
+
+    def receive(self, payload):
+        self.calls.append(payload)
+        self.received.set()
+
+
+class CoroutineSignalModel(SignalModel):
+    async def receive(self, payload):
+        super().receive(payload)
+
+
+class InprocSignalModel(SignalModel):
+    def create_context(self):
+        return zmq.Context()  # inproc addresses of this context can't be reached from the shared context
@@ -0,0 +1,97 @@
+import asyncio
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from experimentor.drivers.ni.ni6251 import niDAQ
+
+
+class Int32:
+    def __init__(self, value=0):
+        self.value = value
+
+
+class TaskHandle:
+    def __init__(self, value=0):
+        self.value = value
+
+
+class TestNIDAQ(unittest.TestCase):
+    def setUp(self) -> None:
+        self.nidaq = MagicMock(int32=Int32, TaskHandle=TaskHandle, byref=lambda obj: obj)
+        self.nidaq.DAQmxReadAnalogF64.side_effect = self.read_analog
+        self.readings = []  # Points returned by each call to DAQmxReadAnalogF64, one row per channel
+        with patch.dict(sys.modules, {'PyDAQmx': self.nidaq}):
+            self.daq = niDAQ()
+
+    def read_analog(self, task, points, timeout, fill_mode, data, size, read, reserved):
+        reading = self.readings.pop(0)
+        data[:reading.size] = reading.ravel()
+        read.value = reading.shape[1]
+
+    def test_read_returns_new_arrays(self):
+        task = self.daq.analogSetup(0, 1, 3, .001)
+        self.readings = [np.array([[1., 2, 3]]), np.array([[4., 5, 6]])]
+        values, first = self.daq.analogRead(task, 3)
+        _, second = self.daq.analogRead(task, 3)
+        self.assertEqual(values, 3)
+        np.testing.assert_array_equal(first, [1, 2, 3])
+        np.testing.assert_array_equal(second, [4, 5, 6])
+
+    def test_read_reusing_buffer(self):
+        task = self.daq.analogSetup(0, 1, 3, .001)
+        self.readings = [np.array([[1., 2, 3]]), np.array([[4., 5, 6]])]
+        _, first = self.daq.analogRead(task, 3, reuse_buffer=True)
+        _, second = self.daq.analogRead(task, 3, reuse_buffer=True)
+        self.assertTrue(np.shares_memory(first, second))
+        np.testing.assert_array_equal(first, [4, 5, 6])
+
+    def test_read_ring_wraps(self):
+        task = self.daq.analogSetup(0, [1, 2], 0, .001)
+        self.readings = [
+            np.array([[1., 2, 3], [10, 20, 30]]),
+            np.array([[4., 5, 6, 7], [40, 50, 60, 70]]),
+            np.arange(6.).reshape(1, 6).repeat(2, axis=0),
+        ]
+        ring, index = self.daq.analogReadRing(task, capacity=5)
+        self.assertEqual(index, 3)
+        np.testing.assert_array_equal(ring[:, :3], [[1, 2, 3], [10, 20, 30]])
+        ring, index = self.daq.analogReadRing(task, capacity=5)
+        self.assertEqual(index, 2)
+        np.testing.assert_array_equal(ring, [[6, 7, 3, 4, 5], [60, 70, 30, 40, 50]])
+        ring, index = self.daq.analogReadRing(task, capacity=5)  # More points than fit in the ring
+        self.assertEqual(index, 0)
+        np.testing.assert_array_equal(ring, [[1, 2, 3, 4, 5], [1, 2, 3, 4, 5]])
+
+    def test_wait_until_done_async(self):
+        async def wait_all():
+            return await asyncio.gather(self.daq.waitUntilDoneAsync(first, 1), self.daq.waitUntilDoneAsync(second))
+
+        first = self.daq.analogSetup(0, 1, 3, .001)
+        second = self.daq.analogSetup(1, 2, 3, .001)
+        self.assertEqual(asyncio.run(wait_all()), [first, second])
+        self.nidaq.DAQmxWaitUntilTaskDone.assert_any_call(self.daq.getTask(first)['TaskHandle'], 1)
+        self.nidaq.DAQmxWaitUntilTaskDone.assert_any_call(self.daq.getTask(second)['TaskHandle'], -1)
+
+    def test_setup_reuse(self):
+        first = self.daq.analogSetup(0, 1, 3, .001)
+        second = self.daq.analogSetup(1, 1, 3, .001)
+        self.assertNotEqual(first, second)  # Both tasks can acquire at the same time
+        self.nidaq.DAQmxStopTask.assert_not_called()
+        self.assertEqual(self.daq.analogSetup(2, 1, 3, .001, reuse=True), second)
+        self.nidaq.DAQmxStopTask.assert_called_once_with(self.daq.getTask(second)['TaskHandle'])
+
+    def test_cleared_task_not_reused(self):
+        task = self.daq.analogSetup(0, 1, 3, .001)
+        self.daq.clear(task)
+        self.nidaq.DAQmxClearTask.assert_called_once_with(self.daq.getTask(task)['TaskHandle'])
+        self.assertNotEqual(self.daq.analogSetup(1, 1, 3, .001, reuse=True), task)
+        self.nidaq.DAQmxStopTask.assert_not_called()
+
+    def test_close_clears_all_tasks(self):
+        tasks = [self.daq.analogSetup(0, 1, 3, .001), self.daq.analogSetup(1, 1, 3, .001)]
+        self.daq.close()
+        self.assertEqual([self.daq.getTask(task)['alive'] for task in tasks], [0, 0])
+        self.assertEqual(self.daq.setups, {})
@@ -0,0 +1,49 @@
+import unittest
+from multiprocessing import Event
+from threading import Event as ThreadEvent
+from unittest.mock import patch
+
+import numpy as np
+
+from experimentor.config import settings
+from experimentor.core.publisher import Publisher
+from experimentor.core.pusher import Pusher
+from experimentor.core.subscriber import Subscriber
+
+
+@patch.object(settings, 'PUBLISHER_PUBLISH_PORT', 5556, create=True)
+@patch.object(settings, 'PUBLISHER_PULL_PORT', 5557, create=True)
+class TestPublisher(unittest.TestCase):
+    def forward(self, payload):
+        """ Publishes the payload through a new Publisher until a Subscriber gets it, then stops both. Returns the
+        received data and the stopped publisher. """
+        received = []
+        arrived = ThreadEvent()
+
+        def receive(data):
+            received.append(data)
+            arrived.set()
+
+        publisher = Publisher(Event())
+        publisher.start()
+        subscriber = Subscriber(receive, f'tcp://localhost:{settings.PUBLISHER_PUBLISH_PORT}', 'topic')
+        with Pusher() as pusher:
+            # Subscribers miss what is published before they connect, the message is repeated until one arrives
+            for _ in range(50):
+                pusher.publish(payload, 'topic')
+                if arrived.wait(.1):
+                    break
+        subscriber.stop()
+        publisher.stop()
+        return received[0], publisher
+
+    def test_forward_and_stop(self):
+        data, publisher = self.forward('payload')
+        self.assertEqual(data, 'payload')
+        self.assertEqual(publisher.exitcode, 0)
+        self.assertTrue(publisher._event.is_set())
+
+    def test_forward_fortran_array(self):
+        frame = np.arange(12, dtype=np.uint16).reshape(3, 4).T  # Camera frames are transposed like this
+        data, _ = self.forward(frame)
+        np.testing.assert_array_equal(data, frame)
@@ -0,0 +1,53 @@
+import json
+import unittest
+
+import numpy as np
+
+from experimentor.core.serialization import dumps_array_metadata, dumps_metadata, dumps_object, encode_topic, \
+    loads_metadata, loads_object
+
+
+class TestMetadata(unittest.TestCase):
+    def test_round_trip(self):
+        metadata = {'numpy': True, 'dtype': 'uint16', 'shape': [10, 20], 'i': 3}
+        self.assertEqual(loads_metadata(dumps_metadata(metadata)), metadata)
+        self.assertEqual(loads_metadata(memoryview(dumps_metadata(metadata))), metadata)
+
+    def test_compatible_with_json(self):
+        metadata = {'numpy': False}
+        self.assertEqual(json.loads(dumps_metadata(metadata)), metadata)
+        self.assertEqual(loads_metadata(json.dumps(metadata).encode()), metadata)
+
+    def test_array_metadata(self):
+        array = np.zeros((10, 20), dtype=np.uint16)
+        metadata = loads_metadata(dumps_array_metadata(array, 5))
+        self.assertEqual(metadata, {'numpy': True, 'dtype': '<u2', 'shape': [10, 20], 'i': 5})
+        self.assertEqual(np.dtype(metadata['dtype']), array.dtype)
+
+    def test_array_metadata_fallback(self):
+        array = np.zeros((1, 2, 3, 4, 5))
+        self.assertEqual(loads_metadata(dumps_array_metadata(array))['shape'], [1, 2, 3, 4, 5])
+
+
+class TestObjects(unittest.TestCase):
+    def test_round_trip(self):
+        frames = dumps_object('stop')
+        self.assertEqual(len(frames), 1)
+        self.assertEqual(loads_object(frames), 'stop')
+
+    def test_arrays_out_of_band(self):
+        payload = {'args': (np.arange(1000, dtype=np.uint16), ), 'kwargs': {'i': 1}}
+        frames = dumps_object(payload)
+        self.assertEqual(len(frames), 2)
+        self.assertLess(len(frames[0]), 1000)
+        frames = [bytes(frame) for frame in frames]  # As they arrive from a socket
+        data = loads_object(frames)
+        np.testing.assert_array_equal(data['args'][0], payload['args'][0])
+        self.assertEqual(data['kwargs'], {'i': 1})
+
+
+class TestTopics(unittest.TestCase):
+    def test_encode_is_cached(self):
+        topic = encode_topic('new_image')
+        self.assertEqual(topic, b'new_image')
+        self.assertIs(encode_topic('new_image'), topic)
@@ -0,0 +1,44 @@
+import unittest
+
+import numpy as np
+
+from experimentor.core.shared_arrays import SharedArrayRing, _opened, read_shared_array
+
+
+class TestSharedArrays(unittest.TestCase):
+    def setUp(self) -> None:
+        self.ring = SharedArrayRing(slots=2)
+
+    def tearDown(self) -> None:
+        self.ring.close()
+
+    def test_put_read(self):
+        array = np.arange(20, dtype=np.uint16).reshape(4, 5)
+        metadata = self.ring.put(array)
+        np.testing.assert_array_equal(read_shared_array(metadata), array)
+        transposed = np.asfortranarray(array.T)
+        np.testing.assert_array_equal(read_shared_array(self.ring.put(transposed)), transposed)
+
+    def test_overwritten_slot(self):
+        metadata = self.ring.put(np.zeros(10))
+        self.ring.put(np.ones(10))
+        self.ring.put(np.ones(10))
+        self.assertIsNone(read_shared_array(metadata))
+
+    def test_larger_array(self):
+        self.ring.put(np.zeros(10))
+        array = np.arange(1000)
+        np.testing.assert_array_equal(read_shared_array(self.ring.put(array)), array)
+
+    def test_read_without_copy(self):
+        array = np.arange(10)
+        data = read_shared_array(self.ring.put(array), copy=False)
+        np.testing.assert_array_equal(data, array)
+        self.assertFalse(data.flags.writeable)
+
+    def test_larger_array_closes_old_block(self):
+        read_shared_array(self.ring.put(np.zeros(10)))
+        old = _opened[self.ring._id]
+        read_shared_array(self.ring.put(np.zeros(1000)))
+        self.assertIsNot(_opened[self.ring._id], old)
+        self.assertIsNone(old.buf)